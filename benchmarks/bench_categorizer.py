@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+新闻分类基准
+
+比较原来的逐条子串判断（只看标题、命中第一个类别即停止）与 Categorizer
+加权评分（标题+摘要、所有类别、多标签）在大量新闻上的耗时，以及两者
+分类结果的差异。周报、月报需要对历史新闻整批分类，默认使用5万条。
+
+用法：
+    python benchmarks/bench_categorizer.py [新闻条数，默认50000]
+"""
+
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from categorizer import Categorizer  # noqa: E402
+
+TOPIC_WORDS = ('model launch startup funding policy research paper regulation product partnership '
+               'venture series benchmark government lawsuit customers 发布 融资 监管 论文').split()
+FILLER_WORDS = ('openai gpt agent chip data cloud robot the a of to and in for with on new says its '
+                'will after over more than users week today 人工智能 大模型 芯片').split()
+
+LEGACY_KEYWORDS = {
+    'research': ['research', 'paper', 'study', 'algorithm', 'model', 'neural', 'deep learning'],
+    'industry': ['company', 'product', 'launch', 'release', 'update', 'partnership'],
+    'startups': ['startup', 'funding', 'raise', 'venture', 'seed', 'series'],
+    'policy': ['regulation', 'policy', 'law', 'government', 'ethics', 'guidelines']
+}
+
+
+def _text(rng: random.Random, words: int, topics: int) -> str:
+    """大部分是普通词，夹杂 topics 个类别关键词"""
+    tokens = rng.choices(FILLER_WORDS, k=words)
+    for position in rng.sample(range(words), topics):
+        tokens[position] = rng.choice(TOPIC_WORDS)
+    return ' '.join(tokens)
+
+
+def make_items(count: int):
+    rng = random.Random(42)
+    return [{
+        'title': _text(rng, 10, rng.randint(0, 2)),
+        'summary': _text(rng, 50, rng.randint(0, 5)),
+        'link': f'https://example.com/news/{i}',
+        'source': 'Bench'
+    } for i in range(count)]
+
+
+def legacy_categorize(news_items):
+    """原来的 BriefGenerator.categorize_news"""
+    categories = {name: [] for name in list(LEGACY_KEYWORDS) + ['other']}
+    for item in news_items:
+        title_lower = item['title'].lower()
+        for category, words in LEGACY_KEYWORDS.items():
+            if any(word in title_lower for word in words):
+                categories[category].append(item)
+                break
+        else:
+            categories['other'].append(item)
+    return categories
+
+
+def timed(label: str, func, count: int, repeat: int = 3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best:8.3f}s  {count / best:>9.0f} 条/s")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    items = make_items(count)
+    print(f"{count} 条新闻（标题10词，摘要50词）")
+
+    legacy = timed('原实现（仅标题，首个命中）', lambda: legacy_categorize(items), count)
+
+    categorizer = Categorizer()
+    labels = timed('加权评分（标题+摘要）', lambda: categorizer.categorize_batch(items), count)
+
+    print("\n各类别新闻数（主类别）")
+    primary = Counter(item_labels[0] for item_labels in labels)
+    for name in categorizer.names + ['other']:
+        print(f"  {name:<10} 原实现 {len(legacy[name]):>7}   评分 {primary.get(name, 0):>7}")
+    multi = sum(1 for item_labels in labels if len(item_labels) > 1)
+    print(f"有多个标签的新闻: {multi} ({multi / count:.0%})")
+
+
+if __name__ == '__main__':
+    main()
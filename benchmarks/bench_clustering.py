@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+事件聚类基准
+
+生成若干"事件"，每个事件由1到4个来源各自撰写报道（共享公司名、产品名等
+专有名词，其余措辞各不相同），比较 StoryClusterer 的倒排索引分块与两两比较
+全部新闻的耗时和聚类结果，并按生成时的事件标签计算准确率。
+
+用法：
+    python benchmarks/bench_clustering.py [新闻条数，默认3000]
+"""
+
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from clustering import StoryClusterer, cosine, tfidf_vectors  # noqa: E402
+from dedup import _UnionFind  # noqa: E402
+
+GENERAL_WORDS = ('model launch release company startup funding raise chip data agent research paper '
+                 'benchmark users training inference open source policy reasoning customers enterprise '
+                 'cloud robot platform update report week deal plan team billion million announced').split()
+ACTIONS = ('launches releases unveils raises acquires sues partners with opens cuts expands delays '
+           'announces').split()
+SYLLABLES = 'ka zor vex lin tra mo qui nex sol dra bel fen gri hu jo pa wen ti'.split()
+# 其余常用词按齐普夫分布出现，少数词非常常见
+FILLER_WORDS = [''.join(random.Random(i).choices('bcdfghklmnprstvz', k=2)) + 'ion' + str(i) for i in range(500)]
+FILLER_WEIGHTS = [1 / (rank + 1) for rank in range(len(FILLER_WORDS))]
+
+
+def _name(rng: random.Random) -> str:
+    return ''.join(rng.choices(SYLLABLES, k=4)).capitalize()
+
+
+def make_items(count: int):
+    """返回 (新闻列表, 每条新闻所属事件的编号)"""
+    rng = random.Random(42)
+    items, labels = [], []
+    story = 0
+    while len(items) < count:
+        entities = [_name(rng) for _ in range(rng.randint(2, 3))]
+        topic = rng.sample(GENERAL_WORDS, 4)
+        for outlet in range(min(rng.choice((1, 1, 1, 2, 2, 3, 4)), count - len(items))):
+            title = [entities[0], rng.choice(ACTIONS)] + rng.sample(entities[1:] + topic, 3) + \
+                rng.sample(GENERAL_WORDS, 2)
+            summary = rng.sample(entities + topic, 4) + rng.choices(GENERAL_WORDS, k=4) + \
+                rng.choices(FILLER_WORDS, FILLER_WEIGHTS, k=20)
+            rng.shuffle(summary)
+            items.append({
+                'title': ' '.join(title),
+                'summary': ' '.join(summary),
+                'link': f'https://example.com/{story}/{outlet}',
+                'source': f'Outlet {outlet}'
+            })
+            labels.append(story)
+        story += 1
+    return items, labels
+
+
+def all_pairs(clusterer: StoryClusterer, news_items):
+    """两两比较全部新闻的聚类（作为对照）"""
+    vectors = tfidf_vectors([clusterer._text_features(item) for item in news_items])
+    groups = _UnionFind(len(news_items))
+    for i, j in combinations(range(len(news_items)), 2):
+        if cosine(vectors[i], vectors[j]) >= clusterer.threshold:
+            groups.union(i, j)
+    members = {}
+    for i in range(len(news_items)):
+        members.setdefault(groups.find(i), []).append(i)
+    return [members[root] for root in sorted(members)]
+
+
+def pair_set(clusters):
+    return {pair for members in clusters for pair in combinations(members, 2)}
+
+
+def timed(label: str, func, repeat: int = 3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<24} {best * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    items, labels = make_items(count)
+    truth = {}
+    for i, label in enumerate(labels):
+        truth.setdefault(label, []).append(i)
+    print(f"{count} 条新闻，{len(truth)} 个事件")
+
+    clusterer = StoryClusterer()
+    blocked = timed('倒排索引分块', lambda: clusterer.clusters(items))
+    exhaustive = timed('两两比较', lambda: all_pairs(clusterer, items), repeat=1)
+
+    expected = pair_set(truth.values())
+    for label, clusters in (('倒排索引分块', blocked), ('两两比较', exhaustive)):
+        found = pair_set(clusters)
+        correct = len(found & expected)
+        precision = correct / len(found) if found else 1.0
+        recall = correct / len(expected) if expected else 1.0
+        print(f"{label:<24} {len(clusters):>6} 组  准确率 {precision:.1%}  召回率 {recall:.1%}")
+    missed = pair_set(exhaustive) - pair_set(blocked)
+    print(f"两两比较找到、分块漏掉的同组新闻对: {len(missed)}")
+
+
+if __name__ == '__main__':
+    main()
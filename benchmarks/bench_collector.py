@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+新闻收集吞吐量基准
+
+用合成的订阅源、网页和 arXiv 分页响应生成一盘HTTP磁带，在回放模式下
+逐个收集各新闻源（不访问网络、不限速），报告每个新闻源的条目数、
+每秒处理的条目数、各阶段耗时（请求、整体解析、其余处理）和峰值内存。
+
+也可以用真实的录制结果作为固定数据：先录制一次，再反复回放
+    AI_BRIEF_CASSETTE=data/cassette AI_BRIEF_CASSETTE_MODE=record python src/save_brief.py
+    python benchmarks/bench_collector.py --cassette data/cassette
+
+用法：
+    python benchmarks/bench_collector.py [每个新闻源的条目数 ...，默认 1000 10000]
+        [--parse-workers N] [--cassette 目录 [--sources 配置文件]]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import requests  # noqa: E402
+
+from arxiv_harvester import ArxivHarvester, build_query  # noqa: E402
+from cassette import Cassette, REPLAY  # noqa: E402
+from circuit_breaker import CircuitBreaker  # noqa: E402
+from news_collector import NewsCollector  # noqa: E402
+
+AI_WORDS = ['OpenAI', 'GPT', 'LLM', 'neural network', 'transformer', '人工智能', '大语言模型', 'Claude']
+OTHER_WORDS = ('market shares phone battery camera game league weather travel recipe football '
+               'election housing 手机 天气 旅游 比赛').split()
+BASE = 'https://bench.example.com'
+ARXIV_PAGE_SIZE = 2000
+
+
+def _title(rng: random.Random, i: int) -> str:
+    words = rng.choices(OTHER_WORDS, k=8)
+    # 大约一半的条目命中AI关键词
+    if i % 2 == 0:
+        words[rng.randrange(len(words))] = rng.choice(AI_WORDS)
+    return ' '.join(words)
+
+
+def _summary(rng: random.Random) -> str:
+    return ' '.join(rng.choices(OTHER_WORDS, k=40))
+
+
+def synthetic_entries(count: int, seed: int = 42):
+    """按发布时间倒序产出合成条目 (标题, 链接, 摘要, 发布时间)"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    for i in range(count):
+        yield _title(rng, i), f"{BASE}/news/{seed}/{i}", _summary(rng), now - timedelta(minutes=i)
+
+
+def synthetic_rss(count: int, seed: int = 42) -> bytes:
+    """生成包含 count 个条目的 RSS 2.0 订阅源"""
+    parts = ['<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel><title>Bench</title>']
+    for title, link, summary, published in synthetic_entries(count, seed):
+        parts.append(f'<item><title>{title}</title><link>{link}</link><description>{summary}</description>'
+                     f'<pubDate>{format_datetime(published)}</pubDate><category>AI</category></item>')
+    parts.append('</channel></rss>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def synthetic_atom(count: int, seed: int = 43, start: int = 0) -> bytes:
+    """生成包含 count 个条目的 Atom 订阅源（arXiv 的分页响应也用这个格式）"""
+    parts = ['<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench</title>']
+    for i, (title, link, summary, published) in enumerate(synthetic_entries(start + count, seed)):
+        if i < start:
+            continue
+        parts.append(f'<entry><title>{title}</title><link href="{link}"/><id>{link}</id>'
+                     f'<summary>{summary}</summary><published>{published.isoformat()}</published>'
+                     f'<author><name>Author {i % 50}</name></author></entry>')
+    parts.append('</feed>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def synthetic_html(count: int, seed: int = 44) -> bytes:
+    """生成包含 count 篇文章的新闻列表网页"""
+    parts = ['<html><head><meta charset="utf-8"></head><body><div class="list">']
+    for title, link, summary, published in synthetic_entries(count, seed):
+        parts.append(f'<article><h3><a href="{link}">{title}</a></h3><p class="summary">{summary}</p>'
+                     f'<time datetime="{published.isoformat()}">{published:%Y-%m-%d}</time></article>')
+    parts.append('</div></body></html>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def build_fixtures(directory: str, count: int) -> str:
+    """在 directory 中写入新闻源配置和回放磁带，返回配置文件路径"""
+    sources = [
+        {'id': 'bench_rss', 'url': f'{BASE}/rss.xml', 'type': 'rss'},
+        {'id': 'bench_rss_stream', 'url': f'{BASE}/stream.xml', 'type': 'rss', 'stream': True},
+        {'id': 'bench_atom', 'url': f'{BASE}/atom.xml', 'type': 'atom'},
+        {'id': 'bench_html', 'url': f'{BASE}/list.html', 'type': 'html', 'article_selector': 'article',
+         'title_selector': 'h3 a', 'summary_selector': 'p.summary', 'date_selector': 'time',
+         'date_attribute': 'datetime'},
+        {'id': 'bench_arxiv', 'url': f'{BASE}/api/query', 'type': 'arxiv', 'categories': ['cs.AI'],
+         'max_results': count, 'page_size': ARXIV_PAGE_SIZE, 'keyword_filter': False},
+    ]
+    for source in sources:
+        source.setdefault('name', source['id'])
+        source['check_robots'] = False
+        # 只测量处理速度，不因时间预算提前停止
+        source['time_budget'] = None
+
+    cassette = Cassette(os.path.join(directory, 'cassette'))
+    feed_headers = {'Content-Type': 'application/rss+xml; charset=utf-8'}
+    rss = synthetic_rss(count)
+    cassette.save('GET', f'{BASE}/rss.xml', 200, feed_headers, rss)
+    cassette.save('GET', f'{BASE}/stream.xml', 200, feed_headers, rss)
+    cassette.save('GET', f'{BASE}/atom.xml', 200, {'Content-Type': 'application/atom+xml'}, synthetic_atom(count))
+    cassette.save('GET', f'{BASE}/list.html', 200, {'Content-Type': 'text/html; charset=utf-8'},
+                  synthetic_html(count))
+
+    # 与 ArxivHarvester 发出的分页请求使用相同的查询参数
+    arxiv = sources[-1]
+    query = build_query(arxiv)
+    for start in range(0, count, ARXIV_PAGE_SIZE):
+        size = min(ARXIV_PAGE_SIZE, count - start)
+        params = {'search_query': query, 'start': start, 'max_results': size,
+                  'sortBy': 'submittedDate', 'sortOrder': 'descending'}
+        url = requests.Request('GET', arxiv['url'], params=params).prepare().url
+        cassette.save('GET', url, 200, {'Content-Type': 'application/atom+xml'},
+                      synthetic_atom(size, seed=45, start=start))
+
+    sources_path = os.path.join(directory, 'news_sources.json')
+    with open(sources_path, 'w', encoding='utf-8') as f:
+        json.dump({'sources': sources}, f, ensure_ascii=False, indent=2)
+    return sources_path
+
+
+def run(sources_path: str, cassette_dir: str, parse_workers: int):
+    collector = NewsCollector(sources_path=sources_path, parse_workers=parse_workers,
+                              circuit_breaker=CircuitBreaker(state_path=None), report_dir=None,
+                              prometheus_path=None, cassette_dir=cassette_dir, cassette_mode=REPLAY)
+    # 不读写 data/ 中的游标，每次都从第一页开始
+    collector.arxiv_harvester = ArxivHarvester(collector._make_request, cursor_path=None)
+
+    print(f"{'新闻源':<20} {'条目':>8} {'保留':>8} {'耗时s':>8} {'条目/s':>10} "
+          f"{'请求s':>8} {'解析s':>8} {'其余s':>8} {'峰值MB':>8}")
+    total_entries = 0
+    total_elapsed = 0.0
+    try:
+        for source_id in collector.enabled_sources():
+            tracemalloc.start()
+            start = time.perf_counter()
+            collector.collect_all_news(concurrent=False, dedup=False, source_ids=[source_id])
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            metrics = collector.last_run.sources[source_id]
+            status = collector.source_status[source_id]
+            if status['status'] != 'ok':
+                print(f"{source_id:<20} {status['status']}: {status['error']}")
+                continue
+            other = max(0.0, elapsed - metrics.total_time - metrics.parse_time)
+            total_entries += metrics.entries_seen
+            total_elapsed += elapsed
+            print(f"{source_id:<20} {metrics.entries_seen:>8} {metrics.entries_kept:>8} {elapsed:>8.2f} "
+                  f"{metrics.entries_seen / elapsed if elapsed else 0:>10.0f} {metrics.total_time:>8.2f} "
+                  f"{metrics.parse_time:>8.2f} {other:>8.2f} {peak / 1024 / 1024:>8.1f}")
+    finally:
+        collector.close()
+    if total_elapsed:
+        print(f"{'合计':<20} {total_entries:>8} {'':>8} {total_elapsed:>8.2f} {total_entries / total_elapsed:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='新闻收集吞吐量基准')
+    parser.add_argument('sizes', nargs='*', type=int, default=[1000, 10000], help='每个新闻源的条目数')
+    parser.add_argument('--parse-workers', type=int, default=0, help='解析进程数，0 表示在抓取线程中解析')
+    parser.add_argument('--cassette', help='使用已录制的磁带目录，而不是合成数据')
+    parser.add_argument('--sources', default='config/news_sources.json', help='与 --cassette 一起使用的新闻源配置')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print("说明：流式解析的新闻源边下载边解析，解析时间计入“其余”；峰值内存由 tracemalloc 统计")
+    if args.cassette:
+        print(f"\n== 磁带 {args.cassette}（{args.sources}）")
+        run(args.sources, args.cassette, args.parse_workers)
+        return
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            sources_path = build_fixtures(directory, size)
+            print(f"\n== 每个新闻源 {size} 个条目")
+            run(sources_path, os.path.join(directory, 'cassette'), args.parse_workers)
+
+
+if __name__ == '__main__':
+    main()
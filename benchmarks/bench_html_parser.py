@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+网页解析后端基准
+
+比较旧的整页 BeautifulSoup(html.parser) 解析与 html_parser.select_articles
+在各可用后端上的解析时间和内存峰值。
+
+用法：
+    python benchmarks/bench_html_parser.py [保存的列表页目录] [文章选择器]
+
+不指定目录时生成一个带有导航、脚本和侧边栏的合成列表页，分别用 "article"
+和 ".list .item"（列表和列表项都有多个 class，与真实页面一样）测试。
+注意：tracemalloc 只统计 Python 对象，lxml/selectolax 在C层分配的内存不计入。
+"""
+
+import glob
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from html_parser import BACKENDS, _available, select_articles  # noqa: E402
+
+
+def synthetic_page(articles: int = 60, noise_blocks: int = 400, seed: int = 7) -> str:
+    """生成一个文章列表只占页面一小部分的合成列表页"""
+    rng = random.Random(seed)
+    words = 'ai model openai launch chip cloud robot agent data startup funding policy'.split()
+    noise = ''.join(
+        f'<div class="promo-{i}"><ul>' + ''.join(
+            f'<li><a href="/n/{i}/{j}">{" ".join(rng.choices(words, k=6))}</a></li>' for j in range(10)
+        ) + '</ul><script>var x{i} = {i};</script></div>'
+        for i in range(noise_blocks)
+    )
+    items = ''.join(
+        f'<article class="item post-{i}"><h3><a href="/story/{i}">{" ".join(rng.choices(words, k=10))}</a></h3>'
+        f'<p class="summary">{" ".join(rng.choices(words, k=40))}</p>'
+        f'<time datetime="2025-10-06T10:00:00+0000">Oct 6</time></article>'
+        for i in range(articles)
+    )
+    return (f'<html><head><title>x</title></head><body><nav>{noise}</nav>'
+            f'<main><div class="list clearfix">{items}</div></main>{noise}</body></html>')
+
+
+def baseline(html: str, selector: str):
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.select(selector)
+
+
+def measure(label: str, func, pages, selector: str):
+    """返回 (耗时, 找到的文章数)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    found = sum(len(func(page, selector)) for page in pages)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<36} {elapsed:8.3f}s  峰值 {peak / 1024 / 1024:7.1f} MB  文章 {found}")
+    return elapsed, found
+
+
+def compare(pages, selector: str):
+    print(f"选择器: {selector}")
+    base, expected = measure('整页 BeautifulSoup(html.parser)', baseline, pages, selector)
+    for backend in BACKENDS:
+        if not _available(backend):
+            print(f"{'select_articles[' + backend + ']':<36} 未安装，跳过")
+            continue
+        elapsed, found = measure(f'select_articles[{backend}]',
+                                 lambda html, sel: select_articles(html, sel, backend), pages, selector)
+        print(f"{'':<36} 加速比 {base / elapsed:.1f}x")
+        if found != expected:
+            print(f"{'':<36} 警告：文章数与整页解析不同（{found} != {expected}）")
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    if directory:
+        selectors = [sys.argv[2] if len(sys.argv) > 2 else 'article']
+        pages = []
+        for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+    else:
+        selectors = ['article', '.list .item']
+        pages = [synthetic_page(seed=i) for i in range(5)]
+    if not pages:
+        print("没有找到列表页")
+        return
+    print(f"页面数: {len(pages)}，平均大小 {sum(map(len, pages)) / len(pages) / 1024:.0f} KB")
+    for selector in selectors:
+        compare(pages, selector)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+关键词过滤微基准
+
+在合成的新闻条目上比较逐个关键词子串查找（旧实现）与预编译的 KeywordMatcher。
+收集时每条新闻调用一次 find_all（同时判断是否相关并得到命中的关键词），
+因此以 find_all 的耗时计算加速比。
+
+用法：python benchmarks/bench_keyword_matcher.py [条目数]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from keyword_matcher import KeywordMatcher  # noqa: E402
+
+# 与 NewsCollector.ai_keywords 保持一致（含旧列表中的重复项）
+KEYWORDS = [
+    'AI model', 'LLM', 'Large Language Model', 'GPT', 'Claude', 'Gemini',
+    'AI agent', 'autonomous agent', 'AI assistant', 'AI chatbot',
+    'machine learning model', 'deep learning model', 'neural network',
+    'transformer', 'diffusion model', 'stable diffusion', 'midjourney',
+    'dall-e', 'sora', 'anthropic', 'openai', 'google ai', 'meta ai',
+    'microsoft ai', 'amazon ai', 'apple ai',
+    '人工智能', 'AI模型', '大语言模型', 'GPT', 'Claude', 'Gemini',
+    'AI助手', 'AI聊天机器人', '机器学习', '深度学习', '神经网络',
+    'Transformer', '扩散模型', 'Stable Diffusion', 'Midjourney',
+    'DALL-E', 'Sora', 'Anthropic', 'OpenAI', '谷歌AI', 'Meta AI',
+    '微软AI', '亚马逊AI', '苹果AI'
+]
+
+FILLER = ('the company said on monday that its quarterly results beat expectations while '
+          'analysts remain cautious about supply chains energy prices and the broader market '
+          'outlook for consumer electronics cloud services and semiconductors').split()
+
+
+def make_entries(count: int, hit_ratio: float = 0.2, seed: int = 42):
+    """生成 (标题, 摘要) 列表，约 hit_ratio 的条目包含一个AI关键词"""
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(count):
+        title = ' '.join(rng.choices(FILLER, k=10))
+        summary = ' '.join(rng.choices(FILLER, k=60))
+        if rng.random() < hit_ratio:
+            words = summary.split()
+            words.insert(rng.randrange(len(words)), rng.choice(KEYWORDS))
+            summary = ' '.join(words)
+        entries.append((title, summary))
+    return entries
+
+
+def naive_is_ai_related(title, summary, keywords):
+    """旧版 NewsCollector._is_ai_related 的实现"""
+    text = (title + ' ' + summary).lower()
+    return any(keyword.lower() in text for keyword in keywords)
+
+
+def naive_filter(entries, keywords):
+    return sum(1 for title, summary in entries if naive_is_ai_related(title, summary, keywords))
+
+
+def matcher_filter(entries, matcher):
+    return sum(1 for title, summary in entries if matcher.matches(f"{title} {summary}"))
+
+
+def matcher_find_all(entries, matcher):
+    return sum(len(matcher.find_all(f"{title} {summary}")) for title, summary in entries)
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  结果={result}")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    entries = make_entries(count)
+    print(f"条目数: {count}")
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(KEYWORDS)
+    print(f"{'编译匹配器':<28} {time.perf_counter() - start:8.3f}s  关键词={len(matcher.keywords)}")
+
+    naive = timed('逐个关键词子串查找', naive_filter, entries, KEYWORDS)
+    timed('KeywordMatcher.matches', matcher_filter, entries, matcher)
+    compiled = timed('KeywordMatcher.find_all', matcher_find_all, entries, matcher)
+    print(f"加速比（find_all）: {naive / compiled:.1f}x")
+
+    # 关键词数量增加时，逐个子串查找线性变慢，合并前缀的正则基本不变
+    keywords = KEYWORDS + [f'synthetic keyword {i}' for i in range(300)]
+    large = KeywordMatcher(keywords)
+    print(f"\n关键词扩充到 {len(large.keywords)} 个:")
+    naive = timed('逐个关键词子串查找', naive_filter, entries, keywords)
+    compiled = timed('KeywordMatcher.find_all', matcher_find_all, entries, large)
+    print(f"加速比（find_all）: {naive / compiled:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+新闻对象内存基准
+
+比较普通字典和 NewsItem 保存大量新闻时的内存占用，以及与字典/JSON互相转换的耗时。
+英文和中文新闻分别测量（大部分新闻源是中文的）。
+
+用法：
+    python benchmarks/bench_news_item.py [新闻条数，默认50000]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from models import NewsItem  # noqa: E402
+
+WORDS = ('openai model launch gpt agent chip data cloud robot startup funding policy '
+         '人工智能 大模型 发布 芯片').split()
+# 中文新闻：词之间没有空格，摘要约240个字
+CJK_WORDS = ('人工智能 大模型 发布 芯片 融资 初创公司 监管 政策 推理 训练 算力 数据中心 '
+             '开源 智能体 机器人 用户 企业 合作 表示 今天 新一代 能力 提升').split()
+SOURCES = ['TechCrunch AI (RSS)', 'AI News', 'MIT Technology Review', 'The Verge AI', 'Wired AI', '36氪']
+
+
+def _cjk_text(rng: random.Random, chars: int) -> str:
+    # 词的平均长度约为2.5个字
+    return ''.join(rng.choices(CJK_WORDS, k=chars // 2))[:chars] + '。'
+
+
+def raw_items(count: int, cjk: bool = False):
+    """模拟解析结果：每条新闻的字段都是新创建的字符串"""
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        yield {
+            'title': _cjk_text(rng, 24) if cjk else ' '.join(rng.choices(WORDS, k=10)),
+            'link': f'https://example.com/news/{i}',
+            'published': now - timedelta(minutes=i),
+            'summary': _cjk_text(rng, 240) if cjk else ' '.join(rng.choices(WORDS, k=60)),
+            # 模拟从响应中解析出来的来源名：内容相同但不是同一个对象
+            'source': ''.join(list(SOURCES[i % len(SOURCES)])),
+            'keywords': [''.join(list('openai')), ''.join(list('GPT'))]
+        }
+
+
+def measure(label: str, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {current / 1024 / 1024:7.1f} MB  构建 {elapsed:.2f}s")
+    return items
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"新闻条数: {count}")
+    for label, cjk in (('英文为主（夹杂中文词）的', False), ('中文', True)):
+        print(f"\n{label}新闻")
+        dicts = measure('dict', lambda: list(raw_items(count, cjk)))
+        del dicts
+        items = measure('NewsItem', lambda: [NewsItem.from_dict(raw) for raw in raw_items(count, cjk)])
+
+    start = time.perf_counter()
+    total = sum(len(item['summary']) for item in items)
+    print(f"读取摘要   {time.perf_counter() - start:.2f}s（{total} 字）")
+
+    start = time.perf_counter()
+    dicts = [item.to_dict() for item in items]
+    print(f"to_dict    {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    restored = [NewsItem.from_json(item.to_json()) for item in items[:10000]]
+    print(f"JSON往返(1万条) {time.perf_counter() - start:.2f}s")
+    assert restored[0] == dicts[0]
+
+
+if __name__ == '__main__':
+    main()
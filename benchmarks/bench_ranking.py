@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+摘要排序基准
+
+比较对全部新闻计算得分后完整排序，与 RankingEngine 的堆选择（O(n log k)）
+在大量新闻上取前 k 条的耗时；并模拟常驻模式下新新闻陆续到达后重新挑选，
+此时已有新闻的排序键直接取自缓存。
+
+用法：
+    python benchmarks/bench_ranking.py [新闻条数，默认100000] [k，默认5]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from ranking import RankingEngine  # noqa: E402
+
+SOURCES = ['arXiv', 'TechCrunch AI (RSS)', 'VentureBeat AI (RSS)', 'MIT Technology Review', 'The Verge AI',
+           '36氪', '新浪科技']
+KEYWORDS = ['openai', 'gpt', 'llm', 'agent', 'transformer', '大模型']
+
+
+def make_items(count: int, start: int = 0):
+    rng = random.Random(42 + start)
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(start, start + count):
+        sources = rng.sample(SOURCES, rng.choice((1, 1, 1, 2, 3)))
+        items.append({
+            'title': f'news {i}',
+            'link': f'https://example.com/news/{i}',
+            'source': sources[0],
+            'sources': sources,
+            'keywords': rng.sample(KEYWORDS, rng.randint(0, 4)),
+            'published': now - timedelta(minutes=rng.randint(0, 72 * 60))
+        })
+    return items
+
+
+def timed(label: str, func, repeat: int = 3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<32} {best * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    items = make_items(count)
+    weights = {'arXiv': 0.5}
+    print(f"{count} 条新闻，取前 {k} 条")
+
+    now = datetime.now(timezone.utc)
+    baseline_engine = RankingEngine(weights)
+    baseline = timed('计算得分 + 完整排序', lambda: sorted(
+        items, key=lambda item: baseline_engine.score(item, now), reverse=True)[:k], repeat=1)
+
+    timed('堆选择（首次，计算排序键）', lambda: RankingEngine(weights).top(items, k))
+    engine = RankingEngine(weights)
+    top = engine.top(items, k)
+    timed('堆选择（排序键已缓存）', lambda: engine.top(items, k))
+    assert [item['link'] for item in top] == [item['link'] for item in baseline], "两种方式的结果不一致"
+
+    arrivals = make_items(count // 100, start=count)
+    timed(f'新到 {len(arrivals)} 条后重新挑选', lambda: engine.top(items + arrivals, k))
+
+    print("\n摘要新闻")
+    for item in top:
+        print(f"  {engine.score(item, now):6.3f}  {item['source']:<24} {len(item['sources'])} 个来源  "
+              f"{len(item['keywords'])} 个关键词  {item['published']:%m-%d %H:%M}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+启动时间基准
+
+在新的解释器中用 `python -X importtime` 导入各入口模块，报告总导入时间和
+最慢的几个模块，并检查是否在目标时间内。重量级依赖（tweepy、GitPython、
+fake_useragent、feedparser 等）应该在用到时才导入，不应出现在这里。
+
+用法：
+    python benchmarks/bench_startup.py [重复次数，默认5] [目标毫秒数，默认500]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# 入口模块：定时任务和命令行直接运行的脚本
+ENTRY_POINTS = ['save_brief', 'main', 'brief_generator', 'publisher']
+
+# 启动时不应该导入的模块
+LAZY_MODULES = ['tweepy', 'git', 'fake_useragent', 'feedparser', 'bs4', 'nltk', 'pandas']
+
+
+def import_times(module: str):
+    """在新进程中导入模块，返回 (总耗时微秒, {模块: 累计耗时微秒})
+
+    在临时目录中运行，导入时即使创建了文件也不会留在仓库里。
+    """
+    env = dict(os.environ, PYTHONPATH=SRC)
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # 格式: "import time: 自身耗时 | 累计耗时 | 模块名"（模块名前的缩进表示层级）
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, total_us, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(total_us)
+    return cumulative.get(module, 0), cumulative
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    target_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    failed = False
+    for module in ENTRY_POINTS:
+        runs = [import_times(module) for _ in range(repeat)]
+        best_total, modules = min(runs, key=lambda run: run[0])
+        loaded = [name for name in LAZY_MODULES if name in modules]
+        ok = best_total / 1000 <= target_ms and not loaded
+        failed |= not ok
+        print(f"{module:<16} {best_total / 1000:7.1f} ms  {'OK' if ok else '超出目标'}")
+        if loaded:
+            print(f"    启动时导入了应延迟加载的模块: {', '.join(loaded)}")
+        slowest = sorted(((total, name) for name, total in modules.items()
+                          if name != module and '.' not in name), reverse=True)[:5]
+        for total, name in slowest:
+            print(f"    {name:<24} {total / 1000:7.1f} ms")
+
+    print(f"\n目标: 每个入口模块导入时间不超过 {target_ms:.0f} ms（{repeat} 次中取最快）")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+from feed_stream import iter_feed_entries
+from metrics import counted
+from parse_pool import parse_feed_content
+from robots_cache import CRAWLER_USER_AGENT
+
+DEFAULT_CATEGORIES = ('cs.AI', 'cs.CL', 'cs.LG')
+
+
+def build_query(source: Dict) -> str:
+    """根据新闻源配置构造 arXiv 的 search_query
+
+    配置了 categories 时把所有分类合并为一个 OR 查询，一次请求覆盖全部分类；
+    同时配置 query 时再与全文检索取交集。
+    """
+    categories = source.get('categories')
+    query = source.get('query')
+    if not categories:
+        return f"all:{query}" if query else ' OR '.join(f"cat:{c}" for c in DEFAULT_CATEGORIES)
+    category_query = ' OR '.join(f"cat:{c}" for c in categories)
+    if query:
+        return f"({category_query}) AND all:{query}"
+    return category_query
+
+
+class ArxivHarvester:
+    """分页收集 arXiv 论文，可从中断处继续
+
+    按 submittedDate 倒序，用 start / max_results 逐页请求，每页流式解析。
+    请求间隔由调用方的限速器保证（arXiv 要求两次请求之间至少间隔3秒），
+    解析条目时不再等待。每读完一页就把已收集到的位置写入游标文件，收集完成后
+    清除游标。中断后下次运行仍从第一页开始（期间可能有新论文），游标只说明
+    上次收集没有完成：存在游标时调用方不应前移高水位线，否则下次会把未收集的
+    论文当作旧论文跳过。
+    """
+
+    def __init__(self, make_request: Callable, cursor_path: Optional[str] = 'data/arxiv_cursor.json',
+                 page_size: int = 100, cursor_ttl: int = 24 * 3600):
+        """初始化收集器
+
+        Args:
+            make_request: 发送请求的函数，签名同 NewsCollector._make_request
+            cursor_path: 游标文件路径，为 None 时不保存游标
+            page_size: 每页的论文数（arXiv 建议不超过2000）
+            cursor_ttl: 游标的有效期（秒），过期后从第一页重新开始
+        """
+        self.logger = logging.getLogger(__name__)
+        self.make_request = make_request
+        self.cursor_path = cursor_path
+        self.page_size = page_size
+        self.cursor_ttl = cursor_ttl
+        self._lock = threading.Lock()
+        self._cursors: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """从磁盘加载游标"""
+        if not self.cursor_path or not os.path.exists(self.cursor_path):
+            return {}
+        try:
+            with open(self.cursor_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"加载arXiv游标失败: {str(e)}")
+            return {}
+
+    def _save(self):
+        """将游标写回磁盘"""
+        if not self.cursor_path:
+            return
+        try:
+            directory = os.path.dirname(self.cursor_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.cursor_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cursors, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cursor_path)
+        except Exception as e:
+            self.logger.warning(f"保存arXiv游标失败: {str(e)}")
+
+    def _resume_position(self, source_id: str, query: str) -> int:
+        """返回上次未完成的收集停止的位置，没有有效游标时返回0"""
+        with self._lock:
+            cursor = self._cursors.get(source_id)
+        if not cursor or cursor.get('query') != query:
+            return 0
+        if time.time() - cursor.get('updated_at', 0) > self.cursor_ttl:
+            return 0
+        return cursor.get('start', 0)
+
+    def pending(self, source: Dict) -> bool:
+        """该新闻源上次的收集是否中断、还有论文没有收集"""
+        return self._resume_position(source['id'], build_query(source)) > 0
+
+    def _set_cursor(self, source_id: str, query: str, start: Optional[int]):
+        with self._lock:
+            if start is None:
+                if self._cursors.pop(source_id, None) is None:
+                    return
+            else:
+                self._cursors[source_id] = {'query': query, 'start': start, 'updated_at': time.time()}
+            self._save()
+
+    def harvest(self, source: Dict) -> Iterator[Dict]:
+        """逐条产出论文的原始条目
+
+        从第一页开始共收集 max_results 篇（上次中断时再加上次已收集的篇数），
+        每页 page_size 篇；某页返回的条目不足一页时说明已经没有更多结果。第一页请求失败时抛出异常，之后的页
+        失败时保留游标并返回已收集的部分。调用方提前停止迭代时（超出时间预算、
+        出错等）同样保留游标；因已到达截止时间而停止时，调用方应调用
+        complete() 清除游标。
+
+        Args:
+            source: 新闻源配置，可包含 categories、query、max_results、page_size
+        """
+        query = build_query(source)
+        total = source.get('max_results', 20)
+        page_size = min(source.get('page_size', self.page_size), total)
+        stopped_at = self._resume_position(source['id'], query)
+        if stopped_at:
+            # 上次已收集的论文会被重新读到，多收集同样的篇数才能覆盖上次没有收集的部分
+            self.logger.info(f"{source['name']}上次在第 {stopped_at} 篇中断，从第一页重新收集")
+            total += stopped_at
+        start = 0
+
+        # 使用官方API，添加适当的请求头
+        headers = {
+            'User-Agent': CRAWLER_USER_AGENT,
+            'Accept': 'application/atom+xml',
+            'From': 'your-email@example.com'  # 建议替换为实际邮箱
+        }
+
+        first_page = True
+        try:
+            while start < total:
+                params = {
+                    'search_query': query,
+                    'start': start,
+                    'max_results': min(page_size, total - start),
+                    'sortBy': 'submittedDate',
+                    'sortOrder': 'descending'
+                }
+                try:
+                    response = self.make_request(source['url'], params=params, headers=headers,
+                                                 check_robots=source.get('check_robots', True), stream=True)
+                except Exception as e:
+                    if first_page:
+                        raise
+                    self.logger.warning(f"收集{source['name']}第 {start} 篇起的论文失败: {str(e)}，下次运行时继续")
+                    return
+                first_page = False
+
+                count = 0
+                try:
+                    chunks = counted(response.iter_content(chunk_size=16 * 1024))
+                    for entry in iter_feed_entries(chunks, lambda content: parse_feed_content(content, source)):
+                        count += 1
+                        yield entry
+                finally:
+                    response.close()
+
+                start += count
+                if count < params['max_results']:
+                    break
+                self._set_cursor(source['id'], query, start)
+        except GeneratorExit:
+            # 调用方提前停止：保留游标（除非调用方通过 complete() 说明已收集完）
+            raise
+        self._set_cursor(source['id'], query, None)
+
+    def complete(self, source_id: str):
+        """调用方已到达截止时间、不再需要剩余的论文时调用，清除游标"""
+        self._set_cursor(source_id, '', None)
@@ -1,80 +1,100 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 import jinja2
 import os
 from datetime import datetime
-import nltk
-from nltk.tokenize import sent_tokenize
 import logging
+from categorizer import Categorizer
+from ranking import RankingEngine
 
 class BriefGenerator:
-    def __init__(self, template_dir: str = "config/templates"):
+    def __init__(self, template_dir: str = "config/templates", bytecode_cache_dir: Optional[str] = "data/jinja_cache",
+                 ranking: Optional[RankingEngine] = None):
+        """初始化简报生成器
+
+        Args:
+            template_dir: 模板目录
+            bytecode_cache_dir: 模板编译结果的缓存目录，新进程直接加载而不必重新编译
+                （模板修改后会自动重新编译）；None 表示不缓存
+            ranking: 挑选摘要新闻的排序引擎，默认所有来源权重相同
+        """
         self.template_dir = template_dir
         self.logger = logging.getLogger(__name__)
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_cache_dir)
         self.env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(template_dir)
+            loader=jinja2.FileSystemLoader(template_dir),
+            bytecode_cache=bytecode_cache
         )
-        
-        # 下载必要的NLTK数据
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
+        # 分类关键词只编译一次
+        self.categorizer = Categorizer()
+        # 排序键按新闻缓存，常驻模式下复用同一个生成器时只需计算新到的新闻
+        self.ranking = ranking or RankingEngine()
 
-    def categorize_news(self, news_items: List[Dict]) -> Dict[str, List[Dict]]:
-        """将新闻按类别分类"""
-        categories = {
-            'research': [],
-            'industry': [],
-            'startups': [],
-            'policy': [],
-            'other': []
-        }
-        
-        # 关键词映射
-        keywords = {
-            'research': ['research', 'paper', 'study', 'algorithm', 'model', 'neural', 'deep learning'],
-            'industry': ['company', 'product', 'launch', 'release', 'update', 'partnership'],
-            'startups': ['startup', 'funding', 'raise', 'venture', 'seed', 'series'],
-            'policy': ['regulation', 'policy', 'law', 'government', 'ethics', 'guidelines']
+    def categorize_news(self, news_items: List[Dict], multi_label: bool = False) -> Dict[str, List[Dict]]:
+        """将新闻按类别分类
+
+        按标题和摘要对每个类别加权评分，新闻归入得分最高的类别
+        （multi_label 为 True 时出现在所有达到阈值的类别下），
+        都没有达到阈值的归入 other。
+
+        Returns:
+            {'research': [...], 'industry': [...], 'startups': [...], 'policy': [...], 'other': [...]}
+        """
+        return self.categorizer.group(news_items, multi_label=multi_label)
+
+    def _brief_context(self, news_items: List[Dict]) -> Dict:
+        """简报模板的变量"""
+        return {
+            'date': datetime.now().strftime("%Y-%m-%d"),
+            'news': self.categorize_news(news_items),
+            'total_news': len(news_items)
         }
-        
-        for item in news_items:
-            assigned = False
-            title_lower = item['title'].lower()
-            
-            for category, words in keywords.items():
-                if any(word in title_lower for word in words):
-                    categories[category].append(item)
-                    assigned = True
-                    break
-            
-            if not assigned:
-                categories['other'].append(item)
-        
-        return categories
 
     def generate_brief(self, news_items: List[Dict], template_name: str = "daily_brief.html") -> str:
         """生成每日简报"""
         try:
             template = self.env.get_template(template_name)
-            categorized_news = self.categorize_news(news_items)
             
             # 生成简报内容
-            brief_content = template.render(
-                date=datetime.now().strftime("%Y-%m-%d"),
-                news=categorized_news,
-                total_news=len(news_items)
-            )
+            brief_content = template.render(**self._brief_context(news_items))
             
             return brief_content
         except Exception as e:
             self.logger.error(f"生成简报时出错: {str(e)}")
             return ""
 
+    def render_brief_to_file(self, news_items: List[Dict], path: str,
+                             template_name: str = "daily_brief.html") -> Optional[str]:
+        """生成简报并边渲染边写入文件，不在内存中拼接完整的简报
+
+        先写入临时文件，完成后再替换目标文件，渲染失败时不会留下不完整的简报。
+
+        Returns:
+            写入的文件路径，出错时返回 None
+        """
+        tmp_path = path + '.tmp'
+        try:
+            template = self.env.get_template(template_name)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for chunk in template.generate(**self._brief_context(news_items)):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+            return path
+        except Exception as e:
+            self.logger.error(f"生成简报时出错: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
     def generate_summary(self, news_items: List[Dict], max_items: int = 5) -> str:
-        """生成简短摘要"""
+        """生成简短摘要，列出最重要的 max_items 条新闻
+
+        按时效、来源权重、报道的来源数和命中的关键词排序，见 RankingEngine。
+        """
         summary = []
-        for item in news_items[:max_items]:
+        for item in self.ranking.top(news_items, max_items):
             summary.append(f"• {item['title']} ({item['source']})")
         
         return "\n".join(summary) 
\ No newline at end of file
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# 用环境变量开启，main.py、save_brief.py 等入口无需修改
+CASSETTE_DIR_ENV = 'AI_BRIEF_CASSETTE'
+CASSETTE_MODE_ENV = 'AI_BRIEF_CASSETTE_MODE'
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    """回放时磁带中没有这个请求（不是网络错误，不会重试）"""
+
+
+class Cassette:
+    """录制的HTTP响应
+
+    每个响应按 "方法 URL"（包括查询参数）保存为 <主机>/<哈希>.json（状态码、
+    响应头）和同名的 .body（原始正文）两个文件。
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _paths(self, method: str, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+        host = urlparse(url).netloc.replace(':', '_') or '_'
+        base = os.path.join(self.directory, host, key)
+        return base + '.json', base + '.body'
+
+    def save(self, method: str, url: str, status_code: int, headers: Dict[str, str], body: bytes,
+             reason: str = 'OK'):
+        """保存一个响应（同一请求已存在时覆盖）"""
+        meta_path, body_path = self._paths(method, url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(body_path, 'wb') as f:
+            f.write(body or b'')
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'method': method.upper(), 'url': url, 'status_code': status_code, 'reason': reason,
+                       'headers': dict(headers)}, f, ensure_ascii=False, indent=2)
+
+    def load(self, method: str, url: str) -> Optional[Tuple[Dict, bytes]]:
+        """返回 (元数据, 正文)，没有录制过时返回 None"""
+        meta_path, body_path = self._paths(method, url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            return meta, f.read()
+
+
+class CassetteAdapter(BaseAdapter):
+    """录制或回放HTTP响应的传输适配器
+
+    录制模式下请求照常经由 adapter 发出，收到的每个响应（包括 robots.txt、
+    arXiv 的各页和重定向的中间响应）都写入磁带；流式请求的正文会先完整读取。
+    回放模式下完全不访问网络，磁带中没有的请求抛出 CassetteMiss。
+    """
+
+    def __init__(self, cassette: Cassette, mode: str, adapter: Optional[BaseAdapter] = None):
+        """初始化适配器
+
+        Args:
+            cassette: 保存响应的磁带
+            mode: 'record' 或 'replay'
+            adapter: 录制模式下实际发送请求的适配器
+        """
+        super().__init__()
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"未知的磁带模式: {mode}")
+        if mode == RECORD and adapter is None:
+            raise ValueError("录制模式需要提供实际发送请求的适配器")
+        self.cassette = cassette
+        self.mode = mode
+        self.adapter = adapter
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.mode == REPLAY:
+            return self._replay(request)
+        response = self.adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                     proxies=proxies)
+        # 读取完整正文后，之后的 iter_content() 从内存中分块产出
+        self.cassette.save(request.method, request.url, response.status_code, response.headers,
+                           response.content, response.reason or '')
+        return response
+
+    def _replay(self, request) -> requests.Response:
+        recorded = self.cassette.load(request.method, request.url)
+        if recorded is None:
+            raise CassetteMiss(f"磁带中没有录制这个请求: {request.method} {request.url}", request=request)
+        meta, body = recorded
+        response = requests.Response()
+        response.status_code = meta['status_code']
+        response.reason = meta.get('reason', '')
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(0)
+        response.from_cache = False
+        return response
+
+    def close(self):
+        if self.adapter is not None:
+            self.adapter.close()
+
+
+def cassette_from_env() -> Tuple[Optional[str], Optional[str]]:
+    """读取环境变量中的磁带目录和模式，没有设置目录时返回 (None, None)
+
+    AI_BRIEF_CASSETTE 指定目录；AI_BRIEF_CASSETTE_MODE 为 record 或 replay，
+    默认为 replay。
+    """
+    directory = os.environ.get(CASSETTE_DIR_ENV)
+    if not directory:
+        return None, None
+    return directory, os.environ.get(CASSETTE_MODE_ENV, REPLAY).lower()
@@ -0,0 +1,137 @@
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from keyword_matcher import _trie_pattern
+
+OTHER = 'other'
+
+# 关键词权重：越能单独说明类别的词权重越高，"model" 这类泛用词权重较低
+DEFAULT_CATEGORIES: Dict[str, Dict[str, float]] = {
+    'research': {
+        'research': 2, 'paper': 2, 'arxiv': 2, 'study': 1.5, 'algorithm': 1.5, 'benchmark': 1.5,
+        'dataset': 1.5, 'deep learning': 1.5, 'neural': 1, 'architecture': 1, 'model': 0.5,
+        '论文': 2, '研究': 2, '算法': 1.5, '数据集': 1.5, '模型': 0.5,
+    },
+    'industry': {
+        'partnership': 2, 'launch': 1.5, 'product': 1.5, 'release': 1.5, 'company': 1, 'customers': 1,
+        'enterprise': 1, 'revenue': 1.5, 'update': 0.5,
+        '发布': 1.5, '产品': 1.5, '合作': 1.5, '企业': 1, '营收': 1.5, '上线': 1,
+    },
+    'startups': {
+        'startup': 2.5, 'funding': 2.5, 'venture': 2, 'valuation': 2, 'seed': 1.5, 'series': 1, 'raise': 1.5,
+        'acquisition': 1.5, 'acquire': 1.5,
+        '初创': 2.5, '融资': 2.5, '估值': 2, '收购': 1.5, '天使轮': 2,
+    },
+    'policy': {
+        'regulation': 2.5, 'regulator': 2.5, 'policy': 2, 'law': 1.5, 'government': 1.5, 'ethics': 1.5,
+        'guidelines': 1.5, 'lawsuit': 2, 'copyright': 1.5, 'safety': 1,
+        '监管': 2.5, '政策': 2, '法规': 2, '法律': 1.5, '政府': 1.5, '伦理': 1.5, '版权': 1.5,
+    },
+}
+
+
+class Categorizer:
+    """基于加权关键词评分的新闻分类器
+
+    所有类别的关键词预先按前缀合并编译为正则表达式，标题和摘要各扫描一遍，
+    同时为每个类别累计得分：每个命中的关键词（同一字段内只计一次）
+    贡献 关键词权重 × 字段权重（标题默认2，摘要默认1）。得分不低于
+    threshold、且不低于最高分 multi_label_ratio 倍的类别都是该新闻的
+    标签，按得分从高到低排列；没有标签的新闻归入 other。
+
+    英文关键词只在单词开头匹配（"law" 能命中 "lawmakers"，不会命中
+    "outlaw"），中文关键词按子串匹配；纯ASCII的文本不再扫描中文关键词。
+    """
+
+    def __init__(self, categories: Optional[Mapping[str, Union[Mapping[str, float], Sequence[str]]]] = None,
+                 title_weight: float = 2.0, summary_weight: float = 1.0, threshold: float = 1.0,
+                 multi_label_ratio: float = 0.5):
+        """初始化分类器
+
+        Args:
+            categories: {类别: {关键词: 权重}}，也可以是 {类别: [关键词]}（权重均为1）；
+                默认使用 DEFAULT_CATEGORIES。类别的顺序决定同分时的先后
+            title_weight: 标题中命中的关键词的得分倍数
+            summary_weight: 摘要中命中的关键词的得分倍数
+            threshold: 成为标签所需的最低得分
+            multi_label_ratio: 次要标签的得分至少为最高分的多少倍
+        """
+        self.title_weight = title_weight
+        self.summary_weight = summary_weight
+        self.threshold = threshold
+        self.multi_label_ratio = multi_label_ratio
+
+        self.names: List[str] = []
+        # 小写关键词 -> [(类别序号, 权重)]，同一个词可以属于多个类别
+        self._weights: Dict[str, List] = {}
+        for name, keywords in (categories or DEFAULT_CATEGORIES).items():
+            if name == OTHER:
+                continue
+            index = len(self.names)
+            self.names.append(name)
+            if not isinstance(keywords, Mapping):
+                keywords = {keyword: 1.0 for keyword in keywords}
+            for keyword, weight in keywords.items():
+                key = keyword.strip().lower()
+                if key:
+                    self._weights.setdefault(key, []).append((index, float(weight)))
+
+        # 英文关键词要检查前一个字符，中文关键词不需要；分成两个正则，纯ASCII文本只扫描前者
+        ascii_words = [key for key in self._weights if key[0].isascii() and key[0].isalnum()]
+        other_words = [key for key in self._weights if key not in ascii_words]
+        self._ascii_pattern = re.compile(rf'(?<![a-z0-9])({_trie_pattern(ascii_words)})') if ascii_words else None
+        self._other_pattern = re.compile(f'({_trie_pattern(other_words)})') if other_words else None
+
+    def _field_hits(self, text: str) -> Iterable[str]:
+        """返回文本命中的关键词（小写，不重复）"""
+        if not text:
+            return ()
+        text = text.lower()
+        hits = set(self._ascii_pattern.findall(text)) if self._ascii_pattern is not None else set()
+        if self._other_pattern is not None and not text.isascii():
+            hits.update(self._other_pattern.findall(text))
+        return hits
+
+    def score(self, title: str, summary: str = '') -> Dict[str, float]:
+        """返回新闻在各类别上的得分"""
+        return dict(zip(self.names, self._scores(title, summary)))
+
+    def _scores(self, title: str, summary: str) -> List[float]:
+        scores = [0.0] * len(self.names)
+        for text, field_weight in ((title, self.title_weight), (summary, self.summary_weight)):
+            for key in self._field_hits(text):
+                for index, weight in self._weights[key]:
+                    scores[index] += weight * field_weight
+        return scores
+
+    def _labels(self, scores: Sequence[float]) -> List[str]:
+        top = max(scores, default=0.0)
+        if top < self.threshold:
+            return [OTHER]
+        floor = max(self.threshold, top * self.multi_label_ratio)
+        ranked = sorted((index for index, value in enumerate(scores) if value >= floor),
+                        key=lambda index: -scores[index])
+        return [self.names[index] for index in ranked]
+
+    def categorize(self, item: Mapping) -> List[str]:
+        """返回单条新闻的标签（按得分从高到低，至少一个）"""
+        return self._labels(self._scores(item.get('title', ''), item.get('summary', '')))
+
+    def categorize_batch(self, news_items: Sequence[Mapping]) -> List[List[str]]:
+        """批量分类，返回与 news_items 一一对应的标签列表"""
+        categorize = self.categorize
+        return [categorize(item) for item in news_items]
+
+    def group(self, news_items: Sequence[Mapping], multi_label: bool = False) -> Dict[str, List]:
+        """按类别分组，返回 {类别: [新闻]}（包括 other，空类别也保留）
+
+        Args:
+            news_items: 新闻列表
+            multi_label: 为 True 时新闻出现在它的每个标签下，否则只出现在得分最高的类别下
+        """
+        groups = {name: [] for name in self.names}
+        groups[OTHER] = []
+        for item, labels in zip(news_items, self.categorize_batch(news_items)):
+            for label in labels if multi_label else labels[:1]:
+                groups[label].append(item)
+        return groups
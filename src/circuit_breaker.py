@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(Exception):
+    """新闻源的熔断器处于打开状态，本次跳过"""
+
+
+class CircuitBreaker:
+    """按新闻源划分的熔断器，状态持久化到磁盘
+
+    连续失败 failure_threshold 次，或连续 empty_threshold 次一条条目都解析
+    不到（通常是网页改版），熔断器打开，在冷却时间内直接跳过该新闻源。
+    冷却结束后进入半开状态，下一次运行只做一次快速探测：成功则关闭，
+    失败则重新打开，冷却时间加倍（不超过 max_cooldown）。
+    """
+
+    def __init__(self, state_path: Optional[str] = 'data/source_health.json', failure_threshold: int = 3,
+                 empty_threshold: int = 5, cooldown: float = 3600, max_cooldown: float = 24 * 3600,
+                 probe_budget: float = 15):
+        """初始化熔断器
+
+        Args:
+            state_path: 状态文件路径，为 None 时只在内存中保存
+            failure_threshold: 连续失败多少次后打开
+            empty_threshold: 连续多少次没有解析到条目后打开
+            cooldown: 第一次打开后的冷却时间（秒）
+            max_cooldown: 冷却时间的上限（秒）
+            probe_budget: 半开状态下探测请求的时间预算（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.state_path = state_path
+        self.failure_threshold = failure_threshold
+        self.empty_threshold = empty_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_budget = probe_budget
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """从磁盘加载状态"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"加载新闻源健康状态失败: {str(e)}")
+            return {}
+
+    def _save(self):
+        """将状态写回磁盘（调用方持有锁）"""
+        if not self.state_path:
+            return
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._states, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.warning(f"保存新闻源健康状态失败: {str(e)}")
+
+    def _state(self, source_id: str) -> Dict:
+        return self._states.setdefault(source_id, {
+            'state': CLOSED,
+            'failures': 0,
+            'empty_streak': 0,
+            'last_error': None,
+            'last_success_at': None,
+            'last_failure_at': None,
+            'open_until': None,
+            'cooldown': None
+        })
+
+    def allow(self, source_id: str) -> Optional[str]:
+        """检查是否可以请求该新闻源
+
+        Returns:
+            'closed' 表示正常请求，'half_open' 表示只做一次快速探测，
+            None 表示熔断器打开、应当跳过
+        """
+        with self._lock:
+            state = self._state(source_id)
+            if state['state'] == OPEN:
+                if time.time() < state['open_until']:
+                    return None
+                state['state'] = HALF_OPEN
+                self._save()
+            return state['state']
+
+    def _open(self, source_id: str, state: Dict, reason: str):
+        # 半开探测失败时冷却时间加倍
+        if state['state'] == HALF_OPEN and state['cooldown']:
+            cooldown = min(self.max_cooldown, state['cooldown'] * 2)
+        else:
+            cooldown = self.cooldown
+        state['state'] = OPEN
+        state['cooldown'] = cooldown
+        state['open_until'] = time.time() + cooldown
+        self.logger.warning(f"新闻源 {source_id} 已熔断 {cooldown / 60:.0f} 分钟: {reason}")
+
+    def record_success(self, source_id: str, entries: int):
+        """记录一次成功的请求；entries 为解析到的原始条目数（过滤之前）"""
+        with self._lock:
+            state = self._state(source_id)
+            state['failures'] = 0
+            state['last_success_at'] = time.time()
+            state['empty_streak'] = state['empty_streak'] + 1 if entries == 0 else 0
+            if state['empty_streak'] >= self.empty_threshold or (state['state'] == HALF_OPEN and entries == 0):
+                state['last_error'] = f"连续 {state['empty_streak']} 次没有解析到任何条目"
+                self._open(source_id, state, state['last_error'])
+            else:
+                state['state'] = CLOSED
+                state['open_until'] = None
+                state['cooldown'] = None
+            self._save()
+
+    def record_failure(self, source_id: str, error: Exception):
+        """记录一次失败的请求"""
+        with self._lock:
+            state = self._state(source_id)
+            state['failures'] += 1
+            state['last_error'] = str(error)
+            state['last_failure_at'] = time.time()
+            if state['state'] == HALF_OPEN or state['failures'] >= self.failure_threshold:
+                self._open(source_id, state, str(error))
+            self._save()
+
+    def health_report(self) -> List[Dict]:
+        """返回所有新闻源的健康状态，异常的排在前面"""
+        order = {OPEN: 0, HALF_OPEN: 1, CLOSED: 2}
+        with self._lock:
+            report = [dict(state, source=source_id) for source_id, state in self._states.items()]
+        report.sort(key=lambda r: (order.get(r['state'], 3), -r['failures'], -r['empty_streak'], r['source']))
+        return report
@@ -0,0 +1,151 @@
+import html
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+from dedup import _CJK_RE, _TAG_RE, _WORD_RE, _UnionFind
+
+# 不区分事件的常用英文词，不计入特征
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in into is it its of on or said says than that the '
+    'this to was were will with after about more new now over what who how why'.split()
+)
+_SUFFIXES = ('ing', 'ed', 'es', 's', 'e')
+
+
+@lru_cache(maxsize=65536)
+def _stem(word: str) -> str:
+    """粗略去掉英文词尾，使 release/released/releases 成为同一个特征"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def text_features(text: str) -> Counter:
+    """提取文本特征：去掉常用词并简单去词尾的英文单词，中文按字的二元组"""
+    text = html.unescape(_TAG_RE.sub(' ', text)).lower()
+    features = Counter(_stem(word) for word in _WORD_RE.findall(text) if word not in STOP_WORDS)
+    for run in _CJK_RE.findall(text):
+        features.update(run[i:i + 2] for i in range(max(1, len(run) - 1)))
+    return features
+
+
+def tfidf_vectors(texts: Sequence[Counter]) -> List[Dict[str, float]]:
+    """把每篇文本的特征计数转换为L2归一化的稀疏TF-IDF向量 {特征: 权重}
+
+    idf = ln((1 + 文档数) / (1 + 文档频率)) + 1，出现在所有文本中的特征
+    也保留正的权重；词频按 1 + ln(tf) 计算，避免重复多次的词占据主导。
+    """
+    count = len(texts)
+    document_frequency = Counter()
+    for features in texts:
+        document_frequency.update(features.keys())
+    idf = {feature: math.log((1 + count) / (1 + df)) + 1 for feature, df in document_frequency.items()}
+
+    vectors = []
+    for features in texts:
+        vector = {feature: (1 + math.log(tf)) * idf[feature] for feature, tf in features.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors.append({feature: weight / norm for feature, weight in vector.items()} if norm else {})
+    return vectors
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """两个归一化稀疏向量的余弦相似度"""
+    return sum(a[feature] * b[feature] for feature in a.keys() & b.keys())
+
+
+class StoryClusterer:
+    """把不同来源报道同一事件的新闻聚成一组
+
+    与 collapse_duplicates（合并文字几乎相同的转载）不同，这里处理的是
+    各自撰写、措辞不同的报道。标题+摘要转换为稀疏TF-IDF向量（标题计入
+    title_weight 次），余弦相似度不低于 threshold 的新闻归为一组（传递合并）。
+
+    不做两两比较：每篇新闻只取权重最高的 block_terms 个特征建立倒排索引，
+    共享至少一个这类特征的新闻才计算相似度；出现在超过 max_postings 条新闻中的
+    特征（如 "ai"、"model"）不用于建索引。同一事件的报道通常共享专有名词
+    这类高权重特征，而每个特征最多比较 max_postings 条新闻，整体是线性时间。
+    """
+
+    def __init__(self, threshold: float = 0.4, title_weight: int = 2, block_terms: int = 5,
+                 max_postings: int = 30):
+        """初始化聚类器
+
+        Args:
+            threshold: 归为同一事件的最低余弦相似度
+            title_weight: 标题特征的计数倍数
+            block_terms: 每篇新闻用于建立倒排索引的特征数
+            max_postings: 出现在超过这么多条新闻中的特征不用于建立索引；
+                应大于同一事件可能的报道数
+        """
+        self.threshold = threshold
+        self.title_weight = title_weight
+        self.block_terms = block_terms
+        self.max_postings = max_postings
+
+    def _text_features(self, item: Dict) -> Counter:
+        title = text_features(item.get('title') or '')
+        features = Counter({feature: count * self.title_weight for feature, count in title.items()})
+        features.update(text_features(item.get('summary') or ''))
+        return features
+
+    def clusters(self, news_items: Sequence[Dict]) -> List[List[int]]:
+        """返回聚类结果：每组是新闻序号的列表，组内和组间都按输入顺序排列"""
+        count = len(news_items)
+        vectors = tfidf_vectors([self._text_features(item) for item in news_items])
+        groups = _UnionFind(count)
+
+        document_frequency = Counter()
+        for vector in vectors:
+            document_frequency.update(vector.keys())
+
+        index = {}
+        for i, vector in enumerate(vectors):
+            blocking = [feature for feature in sorted(vector, key=vector.get, reverse=True)
+                        if 2 <= document_frequency[feature] <= self.max_postings][:self.block_terms]
+            compared = set()
+            for feature in blocking:
+                for j in index.get(feature, ()):
+                    if j in compared:
+                        continue
+                    compared.add(j)
+                    if groups.find(i) != groups.find(j) and cosine(vector, vectors[j]) >= self.threshold:
+                        groups.union(i, j)
+                index.setdefault(feature, []).append(i)
+
+        members = {}
+        for i in range(count):
+            members.setdefault(groups.find(i), []).append(i)
+        return [members[root] for root in sorted(members)]
+
+    def cluster(self, news_items: Sequence[Dict]) -> List[Dict]:
+        """把同一事件的报道合并为一条
+
+        每组选报道来源最多的一条（相同时取最先出现的）作为代表，返回它的副本：
+        'sources' 合并组内所有来源，'also_covered_by' 列出其他报道的
+        {'source', 'title', 'link'}。只有一条的组原样返回。
+        """
+        clustered = []
+        for indexes in self.clusters(news_items):
+            if len(indexes) == 1:
+                clustered.append(news_items[indexes[0]])
+                continue
+            representative = max(indexes, key=lambda i: (len(news_items[i].get('sources') or ()), -i))
+            # 保持原来的类型（NewsItem 或字典），与 collapse_duplicates 相同
+            item = news_items[representative].copy()
+            sources = []
+            for i in [representative] + [i for i in indexes if i != representative]:
+                for source in news_items[i].get('sources') or [news_items[i].get('source')]:
+                    if source and source not in sources:
+                        sources.append(source)
+            item['sources'] = sources
+            item['also_covered_by'] = [{
+                'source': news_items[i].get('source'),
+                'title': news_items[i].get('title'),
+                'link': news_items[i].get('link')
+            } for i in indexes if i != representative]
+            clustered.append(item)
+        return clustered
@@ -0,0 +1,240 @@
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+import schedule
+
+from dedup import collapse_duplicates
+from metrics import to_prometheus
+from url_utils import canonicalize_url
+
+
+class BriefDaemon:
+    """常驻进程模式
+
+    收集器、简报生成器和发布器只创建一次，HTTP连接池、robots.txt、
+    条件请求缓存等在各轮之间保持有效。每个新闻源按自己的 poll_minutes
+    定时收集，新新闻先放入待发布列表，到了简报时间再统一去重、生成并发布。
+    可选的HTTP端点 /health 返回运行状态，/metrics 以 Prometheus 文本格式
+    返回各新闻源最近一次收集的指标。
+
+    所有收集和发布任务都在同一个工作线程中依次执行（单次收集内部仍然
+    并发请求各新闻源），调度线程只负责登记到期的任务。
+
+    收集器使用增量模式时，待发布的新闻同时保存在 seen_store 中，发布成功后
+    才删除；进程重启后从中恢复，不会因为已记录为见过而丢失。停止时等待正在
+    执行的任务完成（最多 stop_timeout 秒），不会在发布到一半时退出。
+    """
+
+    def __init__(self, collector, publish: Callable[[List[Dict]], None], brief_times: Optional[List[str]] = None,
+                 default_poll_minutes: int = 60, health_port: Optional[int] = 8080, health_host: str = '127.0.0.1',
+                 stop_timeout: float = 60):
+        """初始化常驻进程
+
+        Args:
+            collector: 保持复用的 NewsCollector（建议使用增量模式）
+            publish: 生成并发布简报的函数，参数为待发布的新闻列表
+            brief_times: 每天生成简报的时间（HH:MM），默认 ['08:00']
+            default_poll_minutes: 没有配置 poll_minutes 的新闻源的收集间隔（分钟）
+            health_port: 健康检查和指标端口，为 None 时不启动
+            health_host: 健康检查监听的地址
+            stop_timeout: 停止时等待正在执行的收集或发布任务的最长时间（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.collector = collector
+        self.publish = publish
+        self.brief_times = brief_times or ['08:00']
+        self.default_poll_minutes = default_poll_minutes
+        self.health_port = health_port
+        self.health_host = health_host
+        self.stop_timeout = stop_timeout
+
+        self.scheduler = schedule.Scheduler()
+        self._tasks = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._due = set()
+        self._collect_queued = False
+        # 等待写入下一期简报的新闻，按规范化链接去重
+        self._pending: Dict[str, Dict] = {}
+        self.store = getattr(collector, 'seen_store', None)
+        if self.store is not None:
+            for item in self.store.pending_items():
+                self._pending.setdefault(canonicalize_url(item['link']), item)
+            if self._pending:
+                self.logger.info(f"恢复了 {len(self._pending)} 条上次未发布的新闻")
+        self.started_at = None
+        self.last_brief = None
+        self.source_status: Dict[str, Dict] = {}
+        self._server = None
+        self._started = None
+        self._worker_thread = None
+
+    def _poll_minutes(self, source_id: str) -> int:
+        return self.collector.sources[source_id].get('poll_minutes', self.default_poll_minutes)
+
+    def _mark_due(self, source_id: str):
+        with self._lock:
+            self._due.add(source_id)
+
+    def _queue_brief(self):
+        self._tasks.put(('brief', None))
+
+    def _dispatch_due(self):
+        """把到期的新闻源合并为一次收集任务；上一次收集还没完成时留到之后"""
+        with self._lock:
+            if not self._due or self._collect_queued:
+                return
+            due = [source_id for source_id in self.collector.enabled_sources() if source_id in self._due]
+            self._due.clear()
+            self._collect_queued = True
+        self._tasks.put(('collect', due))
+
+    def _collect(self, source_ids: List[str]):
+        self.logger.info(f"收集新闻源: {', '.join(source_ids)}")
+        try:
+            items = self.collector.collect_all_news(dedup=False, source_ids=source_ids,
+                                                    keep_pending=self.store is not None)
+        finally:
+            with self._lock:
+                self._collect_queued = False
+        finished = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for item in items:
+                self._pending.setdefault(canonicalize_url(item['link']), item)
+            for source_id, status in self.collector.source_status.items():
+                self.source_status[source_id] = dict(status, last_run=finished)
+            pending = len(self._pending)
+        self.logger.info(f"本轮收集到 {len(items)} 条新新闻，待发布 {pending} 条")
+
+    def _brief(self):
+        with self._lock:
+            items = list(self._pending.values())
+            self._pending = {}
+        if not items:
+            self.logger.warning("没有待发布的新闻，跳过本次简报生成")
+            return
+        pending = items
+        items = collapse_duplicates(items)
+        items.sort(key=lambda x: x['published'], reverse=True)
+        try:
+            self.publish(items)
+            if self.store is not None:
+                self.store.remove_pending(pending)
+            self.last_brief = {'at': datetime.now(timezone.utc).isoformat(), 'count': len(items), 'ok': True}
+        except Exception as e:
+            self.logger.error(f"生成和发布简报时出错: {str(e)}")
+            self.last_brief = {'at': datetime.now(timezone.utc).isoformat(), 'count': len(items), 'ok': False,
+                               'error': str(e)}
+            # 发布失败的新闻留到下一期
+            with self._lock:
+                for item in items:
+                    self._pending.setdefault(canonicalize_url(item['link']), item)
+
+    def _worker(self):
+        while True:
+            task, argument = self._tasks.get()
+            # 停止后不再开始排队中的任务
+            if task == 'stop' or self._stop.is_set():
+                return
+            try:
+                if task == 'collect':
+                    self._collect(argument)
+                elif task == 'brief':
+                    self._brief()
+            except Exception as e:
+                self.logger.error(f"执行任务 {task} 时出错: {str(e)}")
+
+    def status(self) -> Dict:
+        """返回运行状态（/health 的内容）"""
+        with self._lock:
+            pending = len(self._pending)
+            sources = {source_id: dict(status) for source_id, status in self.source_status.items()}
+        for job in self.scheduler.get_jobs():
+            if 'source' in job.tags:
+                source_id = next(tag for tag in job.tags if tag != 'source')
+                sources.setdefault(source_id, {})['next_run'] = job.next_run.isoformat() if job.next_run else None
+        next_brief = min((job.next_run for job in self.scheduler.get_jobs('brief')), default=None)
+        return {
+            'status': 'ok' if not self._stop.is_set() else 'stopping',
+            'started_at': self.started_at,
+            'uptime': round(time.monotonic() - self._started, 1) if self.started_at else 0,
+            'pending_items': pending,
+            'last_brief': self.last_brief,
+            'next_brief': next_brief.isoformat() if next_brief else None,
+            'sources': sources,
+            'health': self.collector.health_report()
+        }
+
+    def _start_health_server(self):
+        daemon = self
+
+        class HealthHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path == '/health':
+                    body = json.dumps(daemon.status(), ensure_ascii=False, default=str).encode('utf-8')
+                    content_type = 'application/json; charset=utf-8'
+                elif path == '/metrics':
+                    body = to_prometheus(dict(daemon.collector.latest_metrics)).encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                daemon.logger.debug(f"health: {format % args}")
+
+        self._server = ThreadingHTTPServer((self.health_host, self.health_port), HealthHandler)
+        threading.Thread(target=self._server.serve_forever, name='health', daemon=True).start()
+        self.logger.info(f"健康检查: http://{self.health_host}:{self._server.server_port}/health")
+
+    def start(self):
+        """启动工作线程、调度任务和健康检查端点（不阻塞）"""
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._started = time.monotonic()
+        for source_id in self.collector.enabled_sources():
+            minutes = self._poll_minutes(source_id)
+            self.scheduler.every(minutes).minutes.do(self._mark_due, source_id).tag('source', source_id)
+            # 启动后立即收集一次
+            self._mark_due(source_id)
+        for brief_time in self.brief_times:
+            self.scheduler.every().day.at(brief_time).do(self._queue_brief).tag('brief')
+
+        self._worker_thread = threading.Thread(target=self._worker, name='brief-worker', daemon=True)
+        self._worker_thread.start()
+        if self.health_port is not None:
+            self._start_health_server()
+
+    def run_forever(self, tick: float = 1.0):
+        """启动并持续运行，直到调用 stop()；返回前等待工作线程完成当前任务"""
+        self.start()
+        self.logger.info(f"常驻模式已启动，每天 {', '.join(self.brief_times)} 生成简报")
+        try:
+            while not self._stop.is_set():
+                self.scheduler.run_pending()
+                self._dispatch_due()
+                self._stop.wait(tick)
+        finally:
+            self._stop.set()
+            self._tasks.put(('stop', None))
+            if self._server is not None:
+                self._server.shutdown()
+            self._worker_thread.join(self.stop_timeout)
+            if self._worker_thread.is_alive():
+                self.logger.warning(f"等待当前任务超过 {self.stop_timeout} 秒，强制退出")
+            else:
+                self.logger.info("常驻模式已停止")
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,204 @@
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+# 常见的日期格式，按出现频率排列；新闻源可在配置中用 date_formats 指定优先尝试的格式
+COMMON_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d %H:%M',
+    '%Y/%m/%d',
+    '%Y年%m月%d日 %H:%M',
+    '%Y年%m月%d日',
+    '%B %d, %Y',
+    '%b %d, %Y',
+)
+
+_RELATIVE_RE = re.compile(r'^(\d+)\s*(秒|分钟|小时|天)前$')
+_RELATIVE_UNITS = {'秒': 'seconds', '分钟': 'minutes', '小时': 'hours', '天': 'days'}
+_DAY_RE = re.compile(r'^(今天|昨天|前天)\s*(?:(\d{1,2}):(\d{2}))?$')
+_DAY_OFFSETS = {'今天': 0, '昨天': 1, '前天': 2}
+_MONTH_DAY_RE = re.compile(r'^(\d{1,2})月(\d{1,2})日\s*(?:(\d{1,2}):(\d{2}))?$')
+_TIME_RE = re.compile(r'^(\d{1,2}):(\d{2})(?::(\d{2}))?$')
+
+# 发布时间最多允许比当前时间晚多少（时钟误差）；更晚的时间视为解析错误
+FUTURE_TOLERANCE = timedelta(minutes=15)
+
+# dateutil 用默认值补全缺少的字段；用两组完全不同的默认值解析，结果不同说明缺少年月日
+_FUZZY_DEFAULTS = (datetime(2000, 1, 1), datetime(2001, 2, 2))
+
+
+def _to_utc(dt: datetime, default_tz: timezone) -> datetime:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=default_tz)
+    return dt.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=8192)
+def _parse_absolute(text: str, formats: tuple, default_tz: timezone) -> Optional[datetime]:
+    """解析不依赖当前时间的日期字符串（结果可缓存）"""
+    for fmt in formats:
+        try:
+            return _to_utc(datetime.strptime(text, fmt), default_tz)
+        except ValueError:
+            pass
+
+    # ISO 8601（Atom、arXiv 及网页的 datetime 属性）
+    try:
+        return _to_utc(datetime.fromisoformat(text), default_tz)
+    except ValueError:
+        pass
+
+    # RFC 822（RSS 的 pubDate）
+    try:
+        return _to_utc(parsedate_to_datetime(text), default_tz)
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    for fmt in COMMON_FORMATS:
+        try:
+            return _to_utc(datetime.strptime(text, fmt), default_tz)
+        except ValueError:
+            pass
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_fuzzy(text: str, default_tz: timezone) -> Optional[datetime]:
+    """最后用 dateutil 尝试其余格式
+
+    只接受包含完整年月日的字符串：缺少的字段不用今天的日期补全，
+    因此结果与当前时间无关，可以缓存。
+    """
+    try:
+        from dateutil import parser as dateutil_parser
+        first, second = (dateutil_parser.parse(text, default=default) for default in _FUZZY_DEFAULTS)
+    except (ImportError, ValueError, OverflowError):
+        return None
+    if first.date() != second.date():
+        return None
+    return _to_utc(first, default_tz)
+
+
+def _parse_relative(text: str, now: datetime, local_tz: timezone) -> Optional[datetime]:
+    """解析中文网站的相对时间，如“5分钟前”“昨天 08:30”“10月6日 14:00”“14:00”"""
+    if text == '刚刚':
+        return now
+
+    match = _RELATIVE_RE.match(text)
+    if match:
+        return now - timedelta(**{_RELATIVE_UNITS[match.group(2)]: int(match.group(1))})
+
+    local_now = now.astimezone(local_tz)
+    match = _DAY_RE.match(text)
+    if match:
+        day = local_now - timedelta(days=_DAY_OFFSETS[match.group(1)])
+        hour, minute = (int(match.group(2)), int(match.group(3))) if match.group(2) else (0, 0)
+        return day.replace(hour=hour, minute=minute, second=0, microsecond=0).astimezone(timezone.utc)
+
+    match = _TIME_RE.match(text)
+    if match:
+        # 只有时间的是今天的新闻；晚于当前时间说明是昨天的
+        hour, minute, second = int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+        try:
+            dt = local_now.replace(hour=hour, minute=minute, second=second, microsecond=0)
+        except ValueError:
+            return None
+        if dt > local_now + FUTURE_TOLERANCE:
+            dt -= timedelta(days=1)
+        return dt.astimezone(timezone.utc)
+
+    match = _MONTH_DAY_RE.match(text)
+    if match:
+        month, day = int(match.group(1)), int(match.group(2))
+        hour, minute = (int(match.group(3)), int(match.group(4))) if match.group(3) else (0, 0)
+        try:
+            dt = local_now.replace(month=month, day=day, hour=hour, minute=minute, second=0, microsecond=0)
+        except ValueError:
+            return None
+        if dt > local_now + timedelta(days=1):
+            # 没有年份的日期不会在未来，说明是去年的新闻
+            dt = dt.replace(year=dt.year - 1)
+        return dt.astimezone(timezone.utc)
+    return None
+
+
+def normalize_date(value: Union[str, time.struct_time, datetime, None],
+                   formats: Sequence[str] = (),
+                   default_tz: timezone = timezone.utc,
+                   now: Optional[datetime] = None) -> Optional[datetime]:
+    """把各种来源的发布时间统一为带时区的UTC时间
+
+    依次处理：feedparser 已解析好的 struct_time（UTC）、datetime、
+    新闻源配置的 date_formats、ISO 8601、RFC 822、常见格式、中文相对时间
+    和只有时间的字符串（相对于 now），最后交给 dateutil（需要完整的年月日）。
+    绝对时间的解析结果按字符串缓存，同一批新闻中重复的日期只解析一次；
+    依赖当前时间的结果不缓存。
+
+    Args:
+        value: 日期字符串、struct_time 或 datetime
+        formats: 优先尝试的 strptime 格式
+        default_tz: 不带时区的时间所在的时区
+        now: 解析相对时间时的当前时间，默认为现在
+
+    Returns:
+        UTC 时间，无法解析时返回 None
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, time.struct_time):
+        # feedparser 的 *_parsed 字段已经转换为UTC
+        return datetime(*value[:6], tzinfo=timezone.utc)
+    if isinstance(value, datetime):
+        return _to_utc(value, default_tz)
+
+    text = ' '.join(str(value).split())
+    if not text:
+        return None
+    parsed = _parse_absolute(text, tuple(formats), default_tz)
+    if parsed is None:
+        parsed = _parse_relative(text, now or datetime.now(timezone.utc), default_tz)
+    if parsed is None:
+        parsed = _parse_fuzzy(text, default_tz)
+    return parsed
+
+
+def clamp_future(published: Optional[datetime], now: Optional[datetime] = None) -> Optional[datetime]:
+    """比当前时间晚超过 FUTURE_TOLERANCE 的发布时间改为当前时间
+
+    时区配置错误或网站的时间有误时，未来的发布时间会使高水位线超前，
+    之后的增量收集会跳过所有新闻。
+    """
+    if published is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    return now if published > now + FUTURE_TOLERANCE else published
+
+
+def source_timezone(source: dict) -> timezone:
+    """新闻源配置中 timezone 字段对应的时区（如 "+08:00"），未配置时为UTC"""
+    offset = source.get('timezone')
+    if not offset:
+        return timezone.utc
+    match = re.match(r'^([+-])(\d{2}):?(\d{2})$', offset)
+    if not match:
+        raise ValueError(f"无效的时区: {offset}")
+    delta = timedelta(hours=int(match.group(2)), minutes=int(match.group(3)))
+    return timezone(-delta if match.group(1) == '-' else delta)
+
+
+def entry_published(source: dict, entry: dict) -> Optional[datetime]:
+    """原始条目的发布时间（UTC），无法解析时返回 None
+
+    优先使用 feedparser 已解析好的 published_parsed，其次按新闻源配置的
+    date_formats 和 timezone 解析日期字符串。
+    """
+    published = normalize_date(entry.get('published_parsed'))
+    if published is None:
+        published = normalize_date(entry.get('date'), source.get('date_formats', ()), source_timezone(source))
+    return published
@@ -0,0 +1,158 @@
+import hashlib
+import html
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List
+
+from url_utils import canonicalize_url
+
+SIMHASH_BITS = 64
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_CJK_RE = re.compile(r'[一-鿿]+')
+
+
+def _features(text: str) -> Counter:
+    """提取文本特征：英文单词及相邻词对，中文按字的二元组"""
+    text = html.unescape(_TAG_RE.sub(' ', text)).lower()
+    words = _WORD_RE.findall(text)
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for run in _CJK_RE.findall(text):
+        features.update(run[i:i + 2] for i in range(max(1, len(run) - 1)))
+    return features
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text: str) -> int:
+    """计算文本的64位SimHash签名
+
+    每一位取所有特征哈希在该位上的多数票。用按位加法器（每层一个整数）
+    代替逐位累加，每个特征只需要约 log2(特征数) 次整数运算。
+    """
+    counters = []  # counters[k] 的第 b 位是第 b 位计数的第 k 个二进制位
+    total = 0
+    for feature, count in _features(text).items():
+        h = _feature_hash(feature)
+        for _ in range(count):
+            total += 1
+            carry = h
+            for k, counter in enumerate(counters):
+                counters[k] = counter ^ carry
+                carry &= counter
+                if not carry:
+                    break
+            if carry:
+                counters.append(carry)
+
+    signature = 0
+    for bit in range(SIMHASH_BITS):
+        ones = 0
+        for k, counter in enumerate(counters):
+            ones |= (counter >> bit & 1) << k
+        if ones * 2 > total:
+            signature |= 1 << bit
+    return signature
+
+
+def _bands(max_distance: int):
+    """把签名分成 max_distance + 1 段
+
+    汉明距离不超过 max_distance 的两个签名至少有一段完全相同（抽屉原理），
+    因此按段建索引不会漏掉任何候选。
+    """
+    count = min(SIMHASH_BITS, max_distance + 1)
+    bands = []
+    start = 0
+    for i in range(count):
+        width = SIMHASH_BITS // count + (1 if i < SIMHASH_BITS % count else 0)
+        bands.append((start, (1 << width) - 1))
+        start += width
+    return bands
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # 保留较早出现的条目作为根，结果与输入顺序一致
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+
+def collapse_duplicates(news_items: List[Dict], max_distance: int = 6) -> List[Dict]:
+    """合并重复和近似重复的新闻
+
+    先按规范化URL合并完全相同的新闻，再对标题+摘要计算SimHash，
+    通过分段（LSH）索引只比较可能相似的候选对，整体接近线性时间。
+    每组保留最先出现的一条，并在 'sources' 中列出所有来源，
+    'duplicate_links' 中列出被合并条目的链接。
+
+    Args:
+        news_items: 新闻列表
+        max_distance: 判定为近似重复的最大汉明距离；标题+摘要较短，
+            改写几个词就会使签名相差3到5位
+    """
+    count = len(news_items)
+    groups = _UnionFind(count)
+
+    by_url = {}
+    for i, item in enumerate(news_items):
+        key = canonicalize_url(item.get('link', ''))
+        if key in by_url:
+            groups.union(by_url[key], i)
+        else:
+            by_url[key] = i
+
+    bands = _bands(max_distance)
+    signatures = []
+    buckets = {}
+    for i, item in enumerate(news_items):
+        signature = simhash(f"{item.get('title', '')} {item.get('summary', '')}")
+        signatures.append(signature)
+        for band, (shift, mask) in enumerate(bands):
+            key = (band, signature >> shift & mask)
+            for j in buckets.get(key, ()):
+                if groups.find(i) != groups.find(j) and hamming_distance(signature, signatures[j]) <= max_distance:
+                    groups.union(i, j)
+            buckets.setdefault(key, []).append(i)
+
+    members = {}
+    for i in range(count):
+        members.setdefault(groups.find(i), []).append(i)
+
+    collapsed = []
+    for root in sorted(members):
+        indexes = members[root]
+        item = news_items[indexes[0]].copy()
+        sources = []
+        for i in indexes:
+            for source in news_items[i].get('sources') or [news_items[i].get('source')]:
+                if source and source not in sources:
+                    sources.append(source)
+        item['sources'] = sources
+        duplicate_links = [news_items[i]['link'] for i in indexes[1:] if news_items[i].get('link')]
+        if duplicate_links:
+            item['duplicate_links'] = duplicate_links
+        collapsed.append(item)
+    return collapsed
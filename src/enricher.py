@@ -0,0 +1,200 @@
+import html
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from retry_policy import DeadlineExceeded
+from url_utils import canonicalize_url
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_NOISE_TAGS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'figure', 'iframe')
+_IMAGE_META = (('property', 'og:image'), ('name', 'og:image'), ('name', 'twitter:image'),
+               ('property', 'twitter:image'))
+
+
+def strip_html(text: str) -> str:
+    """去掉HTML标签和实体，合并空白"""
+    if not text or '<' not in text and '&' not in text:
+        return text
+    return ' '.join(html.unescape(_TAG_RE.sub(' ', text)).split())
+
+
+def extract_article(page: str, base_url: str, max_chars: int = 2000) -> Tuple[str, Optional[str]]:
+    """从文章网页中提取正文和题图
+
+    题图取 og:image / twitter:image；正文优先取 <article>，没有时取段落
+    文字最多的元素，只保留较长的段落（过滤按钮、版权声明等短文本）。
+
+    Returns:
+        (正文, 题图URL)
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page, 'html.parser')
+    image = None
+    for attribute, value in _IMAGE_META:
+        meta = soup.find('meta', attrs={attribute: value})
+        if meta and meta.get('content'):
+            image = urljoin(base_url, meta['content'].strip())
+            break
+
+    for element in soup.find_all(_NOISE_TAGS):
+        element.decompose()
+
+    container = soup.find('article')
+    if container is None:
+        # 按父元素统计段落文字，文字最多的就是正文区域
+        scores = {}
+        for paragraph in soup.find_all('p'):
+            parent = paragraph.parent
+            if parent is not None:
+                scores[id(parent)] = (scores.get(id(parent), (0, parent))[0] + len(paragraph.get_text()), parent)
+        container = max(scores.values(), key=lambda score: score[0])[1] if scores else soup
+
+    paragraphs = []
+    length = 0
+    for paragraph in container.find_all('p'):
+        text = ' '.join(paragraph.get_text(' ').split())
+        if len(text) < 40:
+            continue
+        paragraphs.append(text)
+        length += len(text)
+        if length >= max_chars:
+            break
+    return '\n\n'.join(paragraphs)[:max_chars], image
+
+
+class ArticleEnricher:
+    """文章全文补充
+
+    并发抓取新闻原文页面，提取正文（content）和题图（image），并把
+    摘要中的HTML转换为纯文本。请求与收集新闻源共用 NewsCollector 的会话、
+    限速、robots.txt 和按主机的并发上限。提取结果按规范化URL保存在SQLite
+    中，每篇文章只抓取一次，因此不再写入HTTP缓存；抓取失败的结果在
+    error_ttl 秒后才会重试，超时、连接错误和5xx等临时错误不记录，下次直接重试。
+    """
+
+    def __init__(self, collector, cache_path: str = 'data/article_cache.db', max_workers: int = 8,
+                 max_chars: int = 2000, time_budget: float = 20, error_ttl: int = 24 * 3600,
+                 skip_hosts=('arxiv.org', 'export.arxiv.org')):
+        """初始化
+
+        Args:
+            collector: 提供 fetch() 的 NewsCollector
+            cache_path: 正文缓存数据库路径
+            max_workers: 同时抓取的文章数（同一主机仍受 per_host_limit 限制）
+            max_chars: 保存的正文最大长度
+            time_budget: 每篇文章的时间预算（秒）
+            error_ttl: 抓取失败后多久可以重试（秒）
+            skip_hosts: 不抓取的主机（例如 arXiv 的摘要已经足够完整）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.collector = collector
+        self.max_workers = max_workers
+        self.max_chars = max_chars
+        self.time_budget = time_budget
+        self.error_ttl = error_ttl
+        self.skip_hosts = set(skip_hosts)
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    content TEXT,
+                    image TEXT,
+                    error TEXT,
+                    fetched_at REAL
+                )"""
+            )
+
+    def _lookup(self, urls: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+        """返回缓存中可用的 {URL: (正文, 题图)}；过期的失败记录视为未缓存"""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url, content, image, error, fetched_at FROM articles WHERE url IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for url, content, image, error, fetched_at in rows:
+                    if error is None or now - fetched_at < self.error_ttl:
+                        found[url] = (content or '', image)
+        return found
+
+    def _store(self, url: str, content: str, image: Optional[str], error: Optional[str]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (url, content, image, error, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, content, image, error, time.time())
+            )
+
+    def _fetch(self, key: str, link: str) -> Tuple[str, Optional[str]]:
+        try:
+            response = self.collector.fetch(link, time_budget=self.time_budget, use_cache=False)
+            if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                raise ValueError(f"不是网页: {response.headers.get('Content-Type')}")
+            content, image = extract_article(response.text, response.url or link, self.max_chars)
+            self._store(key, content, image, None)
+            return content, image
+        except Exception as e:
+            self.logger.warning(f"抓取文章失败 {link}: {str(e)}")
+            # 时间预算用完（包括等待本地限速）和可重试的临时错误不记录
+            if not isinstance(e, DeadlineExceeded) and not self.collector.retry_policy.is_retryable(e):
+                self._store(key, '', None, str(e))
+            return '', None
+
+    def enrich(self, news_items: List[Dict], limit: Optional[int] = None) -> List[Dict]:
+        """为新闻补充 content 和 image，并清理摘要中的HTML（原地修改）
+
+        Args:
+            news_items: 新闻列表
+            limit: 只抓取前 limit 条新闻的原文，None 表示全部
+        """
+        for item in news_items:
+            if item.get('summary'):
+                item['summary'] = strip_html(item['summary'])
+
+        targets = {}
+        for item in news_items[:limit] if limit is not None else news_items:
+            link = item.get('link')
+            if not link or urlparse(link).netloc.lower() in self.skip_hosts:
+                continue
+            targets.setdefault(canonicalize_url(link), []).append(item)
+        if not targets:
+            return news_items
+
+        results = self._lookup(list(targets))
+        missing = [key for key in targets if key not in results]
+        self.logger.info(f"补充文章正文：{len(targets)} 篇，其中 {len(missing)} 篇需要抓取")
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='enricher') as executor:
+                fetched = executor.map(lambda key: self._fetch(key, targets[key][0]['link']), missing)
+                results.update(zip(missing, fetched))
+
+        for key, items in targets.items():
+            content, image = results[key]
+            for item in items:
+                if content:
+                    item['content'] = content
+                    if not item.get('summary'):
+                        item['summary'] = content[:300]
+                if image:
+                    item['image'] = image
+        return news_items
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
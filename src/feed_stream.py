@@ -0,0 +1,151 @@
+import xml.etree.ElementTree as ET
+from html.entities import name2codepoint
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+ENTRY_TAGS = ('item', 'entry')
+
+# XML 只预定义了 amp、lt、gt、quot、apos，订阅源中常见的 &nbsp;、&mdash; 等
+# HTML 实体在内部DTD中声明后才能解析
+_XML_ENTITIES = ('amp', 'lt', 'gt', 'quot', 'apos')
+_ENTITY_DTD = ('<!DOCTYPE feed [' + ''.join(
+    f'<!ENTITY {name} "&#{codepoint};">' for name, codepoint in name2codepoint.items() if name not in _XML_ENTITIES
+) + ']>').encode('ascii')
+_BOM = b'\xef\xbb\xbf'
+
+
+def _local(tag: str) -> str:
+    """去掉命名空间，返回标签的本地名"""
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    if element is None:
+        return ''
+    return ''.join(element.itertext()).strip()
+
+
+def _clean(text: str) -> str:
+    """合并空白字符（arXiv 的标题中带有换行）"""
+    return ' '.join(text.split())
+
+
+def _entry_from_element(element: ET.Element) -> Dict:
+    """把 RSS 的 <item> 或 Atom 的 <entry> 转换为原始条目"""
+    children = {}
+    authors = []
+    categories = []
+    link = ''
+    for child in element:
+        name = _local(child.tag)
+        if name == 'link':
+            href = child.get('href')
+            if href is None:
+                # RSS：<link>文本</link>
+                link = link or _text(child)
+            elif child.get('rel', 'alternate') == 'alternate' and not link:
+                link = href
+        elif name in ('author', 'creator'):
+            author = _text(child.find(f'{{{ATOM_NS}}}name')) or _text(child)
+            if author:
+                authors.append(_clean(author))
+        elif name == 'category':
+            term = child.get('term') or _text(child)
+            if term:
+                categories.append(term)
+        else:
+            children.setdefault(name, child)
+
+    def first(*names):
+        for name in names:
+            if name in children:
+                value = _text(children[name])
+                if value:
+                    return value
+        return ''
+
+    return {
+        'id': first('guid', 'id') or link,
+        'title': _clean(first('title')),
+        'link': link,
+        'summary': first('summary', 'description', 'encoded', 'content').strip(),
+        'date': first('published', 'pubDate', 'date', 'updated', 'issued'),
+        'authors': authors,
+        'categories': categories
+    }
+
+
+def _declare_entities(chunk: bytes) -> bytes:
+    """在文档开头（XML声明之后）插入声明了HTML实体的内部DTD；文档自带DTD时不插入"""
+    if b'<!DOCTYPE' in chunk[:4096]:
+        return chunk
+    bom = _BOM if chunk.startswith(_BOM) else b''
+    body = chunk[len(bom):]
+    if body.lstrip().startswith(b'<?xml'):
+        end = body.find(b'?>')
+        if end >= 0:
+            return bom + body[:end + 2] + _ENTITY_DTD + body[end + 2:]
+    return bom + _ENTITY_DTD + body
+
+
+def _with_entity_declarations(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """文档开头（包括XML声明）凑够一定长度后插入DTD，其余数据原样产出"""
+    head = b''
+    for chunk in chunks:
+        if head is None:
+            yield chunk
+            continue
+        head += chunk
+        if len(head) >= 1024:
+            yield _declare_entities(head)
+            head = None
+    if head:
+        yield _declare_entities(head)
+
+
+def iter_feed_entries(chunks: Iterable[bytes],
+                      fallback: Optional[Callable[[bytes], Iterable[Dict]]] = None) -> Iterator[Dict]:
+    """增量解析 RSS/Atom 数据流，逐条产出原始条目
+
+    数据按块送入 XMLPullParser，每解析完一个条目就立即产出，并从文档树中
+    移除，内存占用与订阅源大小无关。调用方停止迭代后不会再读取剩余数据。
+
+    流式解析要求格式正确的XML（HTML实体如 &nbsp; 可以使用）。产出第一个
+    条目之前就解析失败时，读取剩余数据，把完整内容交给 fallback（例如
+    feedparser）解析；已经产出条目后失败，或没有提供 fallback 时抛出 ParseError。
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack = []
+    chunks = iter(chunks)
+    # 产出第一个条目之前保留已读取的数据，解析失败时交给 fallback
+    received = []
+
+    def recorded():
+        for chunk in chunks:
+            if chunk:
+                if received is not None:
+                    received.append(chunk)
+                yield chunk
+
+    try:
+        for chunk in _with_entity_declarations(recorded()):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    stack.append(element)
+                    continue
+                stack.pop()
+                if _local(element.tag) in ENTRY_TAGS:
+                    entry = _entry_from_element(element)
+                    # 丢弃已处理的条目，避免整个文档树留在内存中
+                    if stack:
+                        stack[-1].remove(element)
+                    element.clear()
+                    if entry['title'] and entry['link']:
+                        received = None
+                        yield entry
+        parser.close()
+    except ET.ParseError:
+        if received is None or fallback is None:
+            raise
+        yield from fallback(b''.join(received) + b''.join(chunks))
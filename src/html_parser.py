@@ -0,0 +1,110 @@
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+# 解析后端的优先顺序：selectolax（C实现）> BeautifulSoup + lxml > BeautifulSoup + html.parser
+BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+_COMPOUND_RE = re.compile(r'^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)$')
+
+
+def _available(backend: str) -> bool:
+    try:
+        if backend == 'selectolax':
+            import selectolax.parser  # noqa: F401
+        elif backend == 'lxml':
+            import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@lru_cache(maxsize=None)
+def default_backend() -> str:
+    """返回当前环境中可用的最快后端"""
+    for backend in BACKENDS:
+        if _available(backend):
+            return backend
+    return 'html.parser'
+
+
+class HTMLNode:
+    """不同解析后端节点的统一接口"""
+
+    def __init__(self, node, backend: str):
+        self._node = node
+        self.backend = backend
+
+    def select_one(self, selector: str) -> Optional['HTMLNode']:
+        if self.backend == 'selectolax':
+            found = self._node.css_first(selector)
+        else:
+            found = self._node.select_one(selector)
+        return HTMLNode(found, self.backend) if found is not None else None
+
+    @property
+    def text(self) -> str:
+        if self.backend == 'selectolax':
+            return self._node.text()
+        return self._node.text
+
+    def get(self, attribute: str, default=None):
+        if self.backend == 'selectolax':
+            value = self._node.attributes.get(attribute)
+            return default if value is None else value
+        return self._node.get(attribute, default)
+
+
+def strainer_for(selector: str):
+    """根据选择器的最外层部分构造 SoupStrainer
+
+    例如 ".list .item" 只保留 class 含 list 的元素及其子孙，"div.entry"
+    只保留 class 含 entry 的 div。无法转换的选择器（属性选择器、伪类、
+    逗号分隔的多个选择器等）返回 None，即解析整个页面。
+    """
+    from bs4 import SoupStrainer
+
+    if ',' in selector:
+        return None
+    outermost = selector.strip().split()[0] if selector.strip() else ''
+    match = _COMPOUND_RE.match(outermost)
+    if not match or not outermost:
+        return None
+
+    name, qualifiers = match.group(1), match.group(2)
+    attrs = {}
+    for qualifier in re.findall(r'[.#][\w-]+', qualifiers):
+        if qualifier.startswith('#'):
+            attrs['id'] = qualifier[1:]
+        elif 'class' not in attrs:
+            # SoupStrainer 只能按一个 class 过滤，其余的交给 select() 精确匹配；
+            # 直接传字符串时，有多个 class 的元素（class="list clearfix"）匹配不上
+            attrs['class'] = _has_class(qualifier[1:])
+    return SoupStrainer(name, attrs)
+
+
+def _has_class(name: str):
+    """返回判断 class 属性是否包含 name 的函数（属性值可能是单个 class 或空格分隔的整个值）"""
+    return lambda value: bool(value) and name in value.split()
+
+
+def select_articles(html: str, article_selector: str, backend: Optional[str] = None) -> List[HTMLNode]:
+    """解析网页并返回匹配 article_selector 的节点
+
+    使用 BeautifulSoup 时只构建文章所在子树（SoupStrainer），不再为整个
+    页面建树；selectolax 用C实现解析整页，速度本身已足够快。
+
+    Args:
+        html: 网页内容
+        article_selector: 文章列表项的CSS选择器
+        backend: 'selectolax'、'lxml' 或 'html.parser'，默认自动选择
+    """
+    backend = backend or default_backend()
+    if backend == 'selectolax':
+        from selectolax.parser import HTMLParser
+        return [HTMLNode(node, backend) for node in HTMLParser(html).css(article_selector)]
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, backend, parse_only=strainer_for(article_selector))
+    return [HTMLNode(node, backend) for node in soup.select(article_selector)]
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+
+class HTTPCache:
+    """基于磁盘的HTTP响应缓存
+
+    只保存带有 ETag 或 Last-Modified 校验信息的响应。每个URL对应两个文件：
+    <key>.json 保存校验信息，<key>.body 保存响应正文。
+    """
+
+    def __init__(self, cache_dir: str = 'data/http_cache'):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """返回URL的缓存校验信息，没有缓存时返回 None"""
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(meta_path) or not os.path.exists(body_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"读取HTTP缓存失败: {str(e)}")
+            return None
+
+    def read_body(self, url: str) -> Optional[bytes]:
+        """读取缓存的响应正文"""
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, response) -> bool:
+        """保存响应；没有校验信息的响应不缓存"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return False
+
+        meta_path, body_path = self._paths(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 先写正文再写校验信息，避免出现没有正文的缓存记录
+            with open(body_path + '.tmp', 'wb') as f:
+                f.write(response.content)
+            os.replace(body_path + '.tmp', body_path)
+            meta = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': response.headers.get('Content-Type'),
+                'stored_at': time.time()
+            }
+            with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(meta_path + '.tmp', meta_path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"写入HTTP缓存失败: {str(e)}")
+            return False
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """支持条件请求的传输适配器
+
+    对已缓存的URL发送 If-None-Match / If-Modified-Since；服务器返回304时，
+    用缓存的正文构造200响应，并将 response.from_cache 设为 True，调用方
+    据此可以跳过重复解析。流式请求和带 Cache-Control: no-store 的请求
+    不参与缓存。
+    """
+
+    def __init__(self, cache: HTTPCache, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET' or stream or 'no-store' in request.headers.get('Cache-Control', ''):
+            response = super().send(request, stream=stream, **kwargs)
+            response.from_cache = False
+            return response
+
+        entry = self.cache.lookup(request.url)
+        if entry:
+            if entry.get('etag'):
+                request.headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, stream=stream, **kwargs)
+        response.from_cache = False
+
+        if response.status_code == 304 and entry:
+            body = self.cache.read_body(request.url)
+            if body is not None:
+                response.content  # 读取304的空正文，让连接回到连接池
+                response.status_code = 200
+                response.reason = 'OK (cached)'
+                response._content = body
+                if entry.get('content_type'):
+                    response.headers['Content-Type'] = entry['content_type']
+                response.from_cache = True
+                return response
+        elif response.status_code == 200:
+            self.cache.store(request.url, response)
+
+        return response
@@ -0,0 +1,117 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """把一组关键词按公共前缀合并成一个正则表达式
+
+    例如 ["ai agent", "ai model", "anthropic"] 会生成
+    "a(?:i\\ (?:agent|model)|nthropic)"。Python 的 re 没有 Aho-Corasick，
+    按前缀合并后每个位置只需比较一个分支，速度与关键词数量基本无关。
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        if '' in node and len(node) == 1:
+            return ''
+        optional = '' in node
+        branches = [re.escape(char) + build(node[char]) for char in sorted(k for k in node if k)]
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if optional else pattern
+
+    return build(trie)
+
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+class KeywordMatcher:
+    """预编译的多关键词匹配器
+
+    关键词集合只编译一次。匹配时文本只转换一次小写，再用按前缀合并的
+    正则表达式扫描一遍（纯ASCII的文本不再扫描中文关键词），同时得到命中了
+    哪些关键词；重叠的关键词（如 "stable diffusion" 与 "diffusion model"）
+    都能被找到。重复的关键词（忽略大小写）只保留第一次出现的写法。
+
+    较短的英文单词（如 "AI"）容易误命中其他单词（"said"、"aims"、"thai"）：
+    关键词开头或结尾的英文单词不超过 word_boundary_max_len 个字符时，该侧
+    只在单词边界处匹配，因此 "Google AI" 不会命中 "google aims"，"AI model"
+    不会命中 "thai model"；其余情况按子串匹配，"GPT" 仍可以命中 "ChatGPT"。
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundary_max_len: int = 2):
+        self.word_boundary_max_len = word_boundary_max_len
+        self.keywords: List[str] = []
+        self._canonical: Dict[str, str] = {}
+        for keyword in keywords:
+            keyword = keyword.strip()
+            key = keyword.lower()
+            if keyword and key not in self._canonical:
+                self._canonical[key] = keyword
+                self.keywords.append(keyword)
+
+        # 小写关键词 -> (开头需要单词边界, 结尾需要单词边界)
+        self._boundaries: Dict[str, Tuple[bool, bool]] = {}
+        for key in self._canonical:
+            first = _WORD_RE.match(key)
+            last = re.search(r'[a-z0-9]+$', key)
+            boundaries = (first is not None and len(first.group()) <= word_boundary_max_len,
+                          last is not None and len(last.group()) <= word_boundary_max_len)
+            if any(boundaries):
+                self._boundaries[key] = boundaries
+
+        ascii_words = [key for key in self._canonical if key.isascii()]
+        other_words = [key for key in self._canonical if not key.isascii()]
+        self._ascii_pattern = re.compile(_trie_pattern(ascii_words)) if ascii_words else None
+        self._other_pattern = re.compile(_trie_pattern(other_words)) if other_words else None
+
+    def _hits(self, text: str) -> Iterator[Tuple[int, str]]:
+        """逐个产出 (位置, 小写关键词)；text 已经是小写"""
+        patterns = [self._ascii_pattern]
+        if not text.isascii():
+            patterns.append(self._other_pattern)
+        for pattern in patterns:
+            if pattern is None:
+                continue
+            search = pattern.search
+            position = 0
+            while True:
+                match = search(text, position)
+                if match is None:
+                    break
+                start, end = match.span()
+                # 下一次从下一个字符开始，重叠的关键词也能找到
+                position = start + 1
+                key = match.group()
+                boundaries = self._boundaries.get(key)
+                if boundaries is not None:
+                    if boundaries[0] and start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if boundaries[1] and end < len(text) and _is_word_char(text[end]):
+                        continue
+                yield start, key
+
+    def matches(self, text: str) -> bool:
+        """文本是否命中任意关键词"""
+        return any(True for _ in self._hits(text.lower()))
+
+    def find_all(self, text: str) -> List[str]:
+        """返回文本命中的关键词（按首次出现的位置排序，不重复），没有命中时返回空列表"""
+        hits = sorted(self._hits(text.lower()), key=lambda hit: hit[0])
+        found = []
+        for _, key in hits:
+            keyword = self._canonical[key]
+            if keyword not in found:
+                found.append(keyword)
+        return found
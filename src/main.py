@@ -1,79 +1,141 @@
+import argparse
 import logging
-import schedule
-import time
+import signal
 from datetime import datetime
 from news_collector import NewsCollector
 from brief_generator import BriefGenerator
 from publisher import Publisher
+from daemon import BriefDaemon
+from enricher import ArticleEnricher
+from ranking import RankingEngine
+from clustering import StoryClusterer
 import os
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ai_daily_brief.log'),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
-def generate_and_publish_brief():
+def setup_logging():
+    """配置日志（在 main() 中调用，导入本模块时不创建日志文件）"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('ai_daily_brief.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+def publish_news(news_items, generator: BriefGenerator, publisher: Publisher, enricher: ArticleEnricher = None):
+    """生成简报、保存到本地并发布"""
+    # 把不同来源对同一事件的报道合并为一条，其余报道列在"其他报道"中
+    total = len(news_items)
+    news_items = StoryClusterer().cluster(news_items)
+    if len(news_items) < total:
+        logger.info(f"{total} 条新闻聚合为 {len(news_items)} 个事件")
+
+    if enricher is not None:
+        # 抓取原文，补充正文和题图（已抓取过的文章直接使用缓存）
+        logger.info("补充文章正文...")
+        enricher.enrich(news_items)
+
+    # 生成简报，边渲染边写入本地文件
+    logger.info("生成简报...")
+    brief_filename = f"daily_brief_{datetime.now().strftime('%Y-%m-%d')}.html"
+    if generator.render_brief_to_file(news_items, brief_filename) is None:
+        raise RuntimeError("生成简报失败")
+    logger.info(f"简报已保存到 {brief_filename}")
+    summary = generator.generate_summary(news_items)
+
+    # 打印简报摘要到控制台（完整简报见保存的文件）
+    print("\n=== AI Daily Brief ===")
+    print(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"共收集到 {len(news_items)} 条新闻\n")
+    print("=== 简报摘要 ===")
+    print(summary)
+    print(f"\n完整简报: {os.path.abspath(brief_filename)}")
+
+    # 发布简报（邮件需要时从文件读取完整内容）
+    logger.info("发布简报...")
+    results = publisher.publish_brief(None, summary, brief_filename)
+
+    # 记录发布结果
+    for channel, success in results.items():
+        if success:
+            logger.info(f"成功发布到 {channel}")
+        else:
+            logger.error(f"发布到 {channel} 失败")
+
+def generate_and_publish_brief(enrich: bool = False):
     """生成并发布每日简报"""
+    collector = None
+    enricher = None
     try:
         # 初始化组件
-        collector = NewsCollector()
-        generator = BriefGenerator()
+        collector = NewsCollector(run_budget=600)  # 收集阶段最多10分钟，超时的新闻源会被放弃
+        generator = BriefGenerator(ranking=RankingEngine.from_sources(collector.sources))
         publisher = Publisher()
+        enricher = ArticleEnricher(collector) if enrich else None
         
         # 收集新闻
         logger.info("开始收集新闻...")
         news_items = collector.collect_all_news()
         logger.info(f"收集到 {len(news_items)} 条新闻")
+        for health in collector.health_report():
+            if health['state'] != 'closed':
+                logger.warning(f"新闻源 {health['source']} 状态异常 ({health['state']}): {health['last_error']}")
         
         if not news_items:
             logger.warning("没有收集到新闻，跳过本次简报生成")
             return
         
-        # 生成简报
-        logger.info("生成简报...")
-        brief_content = generator.generate_brief(news_items)
-        summary = generator.generate_summary(news_items)
-        
-        # 打印简报内容到控制台
-        print("\n=== AI Daily Brief ===")
-        print(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"共收集到 {len(news_items)} 条新闻\n")
-        print("=== 简报摘要 ===")
-        print(summary)
-        print("\n=== 完整简报 ===")
-        print(brief_content)
-        
-        # 保存简报到本地文件
-        brief_filename = f"daily_brief_{datetime.now().strftime('%Y-%m-%d')}.html"
-        with open(brief_filename, "w", encoding="utf-8") as f:
-            f.write(brief_content)
-        logger.info(f"简报已保存到 {brief_filename}")
-        
-        # 发布简报
-        logger.info("发布简报...")
-        results = publisher.publish_brief(brief_content, summary, brief_filename)
-        
-        # 记录发布结果
-        for channel, success in results.items():
-            if success:
-                logger.info(f"成功发布到 {channel}")
-            else:
-                logger.error(f"发布到 {channel} 失败")
+        publish_news(news_items, generator, publisher, enricher)
                 
     except Exception as e:
         logger.error(f"生成和发布简报时出错: {str(e)}")
+    finally:
+        if enricher is not None:
+            enricher.close()
+        if collector is not None:
+            collector.close()
+
+def run_daemon(brief_times, health_port, enrich: bool = False):
+    """常驻模式：组件只初始化一次，按各新闻源的频率收集，按简报时间发布"""
+    collector = NewsCollector(incremental=True, run_budget=600)
+    generator = BriefGenerator(ranking=RankingEngine.from_sources(collector.sources))
+    publisher = Publisher()
+    enricher = ArticleEnricher(collector) if enrich else None
+    daemon = BriefDaemon(
+        collector,
+        lambda news_items: publish_news(news_items, generator, publisher, enricher),
+        brief_times=brief_times,
+        health_port=health_port
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if enricher is not None:
+            enricher.close()
+        collector.close()
 
 def main():
     """主程序入口"""
-    # 直接运行一次简报生成
-    generate_and_publish_brief()
+    parser = argparse.ArgumentParser(description='AI Daily Brief')
+    parser.add_argument('--daemon', action='store_true', help='以常驻进程运行，按计划持续收集和发布')
+    parser.add_argument('--brief-at', action='append', metavar='HH:MM',
+                        help='常驻模式下每天生成简报的时间，可指定多次（默认 08:00）')
+    parser.add_argument('--health-port', type=int, default=8080,
+                        help='常驻模式下健康检查端点的端口，0 表示不启动（默认 8080）')
+    parser.add_argument('--enrich', action='store_true', help='抓取新闻原文，为简报补充正文和题图')
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.daemon:
+        run_daemon(args.brief_at or ['08:00'], args.health_port or None, args.enrich)
+    else:
+        # 直接运行一次简报生成
+        generate_and_publish_brief(args.enrich)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,237 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_PREFIX = 'ai_daily_brief_source'
+
+# 当前线程正在记录的新闻源指标
+_local = threading.local()
+
+
+class SourceMetrics:
+    """单个新闻源一次收集的指标（包括重试和备用源）
+
+    时间单位为秒，多次请求时累加。流式解析的订阅源边下载边解析，
+    解析时间计入 total_time，parse_time 只统计整体解析的响应。
+    """
+
+    COUNTERS = ('requests', 'retries', 'cache_hits', 'bytes', 'entries_seen', 'entries_kept',
+                'entries_filtered', 'entries_old')
+    TIMINGS = ('dns_time', 'connect_time', 'tls_time', 'ttfb', 'total_time', 'parse_time')
+
+    __slots__ = COUNTERS + TIMINGS + ('source', 'status', 'elapsed', 'error', 'finished_at')
+
+    def __init__(self, source: str):
+        self.source = source
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        for name in self.TIMINGS:
+            setattr(self, name, 0.0)
+        self.status = None
+        self.elapsed = None
+        self.error = None
+        self.finished_at = None
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in ('source', 'status', 'elapsed', 'error', 'finished_at')}
+        data.update({name: getattr(self, name) for name in self.COUNTERS})
+        data.update({name: round(getattr(self, name), 4) for name in self.TIMINGS})
+        return data
+
+
+def current() -> Optional[SourceMetrics]:
+    """当前线程正在记录的新闻源指标，没有时返回 None"""
+    return getattr(_local, 'metrics', None)
+
+
+@contextmanager
+def recording(metrics: SourceMetrics):
+    """在 with 块内，当前线程的请求和解析都记录到 metrics"""
+    previous = current()
+    _local.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        _local.metrics = previous
+
+
+def counted(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """统计流式下载的字节数"""
+    metrics = current()
+    for chunk in chunks:
+        if metrics is not None:
+            metrics.bytes += len(chunk)
+        yield chunk
+
+
+class _TimedConnectionMixin:
+    """记录新建连接的DNS解析和TCP连接时间（HTTPS连接另外记录TLS握手时间）
+
+    先自行解析域名并计时，再用解析出的IP建立连接，避免重复解析；
+    TLS 的 SNI 和证书校验仍然使用原来的主机名。
+    """
+
+    def _new_conn(self):
+        metrics = current()
+        if metrics is None:
+            return super()._new_conn()
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except (socket.gaierror, IndexError):
+            address = None
+        resolved = time.perf_counter()
+        metrics.dns_time += resolved - start
+        try:
+            if address:
+                self._dns_host = address
+            sock = super()._new_conn()
+        except Exception:
+            if not address:
+                raise
+            # 第一个地址连接失败时，交给 urllib3 依次尝试所有地址
+            self._dns_host = host
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+        metrics.connect_time += time.perf_counter() - resolved
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        metrics = current()
+        if metrics is None:
+            return super().connect()
+        before = metrics.dns_time + metrics.connect_time
+        start = time.perf_counter()
+        super().connect()
+        # connect() 包括 _new_conn() 和 TLS 握手
+        metrics.tls_time += max(0.0, time.perf_counter() - start - (metrics.dns_time + metrics.connect_time - before))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def install_connection_timing(adapter):
+    """让 requests 适配器新建的连接记录DNS、连接和TLS时间"""
+    adapter.poolmanager.pool_classes_by_scheme = {
+        'http': TimedHTTPConnectionPool,
+        'https': TimedHTTPSConnectionPool,
+    }
+
+
+class RunMetrics:
+    """一次收集运行的指标"""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.monotonic()
+        self.finished_at = None
+        self.elapsed = None
+        self.items = None
+        self.sources: Dict[str, SourceMetrics] = {}
+        self._lock = threading.Lock()
+
+    def source(self, name: str) -> SourceMetrics:
+        with self._lock:
+            metrics = self.sources.get(name)
+            if metrics is None:
+                metrics = self.sources[name] = SourceMetrics(name)
+            return metrics
+
+    def finish(self, source_status: Dict[str, Dict], items: int):
+        """记录运行结束时各新闻源的状态"""
+        self.finished_at = datetime.now(timezone.utc)
+        self.elapsed = round(time.monotonic() - self._start, 3)
+        self.items = items
+        for name, status in source_status.items():
+            metrics = self.source(name)
+            metrics.status = status['status']
+            metrics.elapsed = status['elapsed']
+            metrics.error = status['error']
+            metrics.finished_at = self.finished_at.timestamp()
+
+    def to_dict(self) -> Dict:
+        return {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'elapsed': self.elapsed,
+            'items': self.items,
+            'sources': {name: metrics.to_dict() for name, metrics in self.sources.items()}
+        }
+
+    def write_report(self, report_dir: str) -> Optional[str]:
+        """把运行报告写入 report_dir/run_<时间>.json，返回文件路径"""
+        try:
+            os.makedirs(report_dir, exist_ok=True)
+            path = os.path.join(report_dir, f"run_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            return path
+        except Exception as e:
+            logger.warning(f"写入运行报告失败: {str(e)}")
+            return None
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(latest: Dict[str, SourceMetrics]) -> str:
+    """以 Prometheus 文本格式输出各新闻源最近一次收集的指标"""
+    lines = []
+
+    def family(name: str, help_text: str, values):
+        metric = f"{PROMETHEUS_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for source, value in values:
+            lines.append(f'{metric}{{source="{_label(source)}"}} {value}')
+
+    sources = sorted(latest.items())
+    family('up', '最近一次收集是否成功', [(s, 1 if m.status == 'ok' else 0) for s, m in sources])
+    family('last_run_timestamp_seconds', '最近一次收集完成的时间',
+           [(s, m.finished_at or 0) for s, m in sources])
+    family('elapsed_seconds', '最近一次收集的总耗时', [(s, m.elapsed or 0) for s, m in sources])
+    for name in SourceMetrics.TIMINGS:
+        # dns_time -> dns_seconds，ttfb -> ttfb_seconds
+        family(f"{name[:-len('_time')] if name.endswith('_time') else name}_seconds",
+               f'最近一次收集的 {name}（秒）', [(s, round(getattr(m, name), 6)) for s, m in sources])
+    for name in SourceMetrics.COUNTERS:
+        family(name, f'最近一次收集的 {name}', [(s, getattr(m, name)) for s, m in sources])
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(latest: Dict[str, SourceMetrics], path: str):
+    """写入 Prometheus 文本文件（可配合 node_exporter 的 textfile collector）"""
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(to_prometheus(latest))
+        os.replace(path + '.tmp', path)
+    except Exception as e:
+        logger.warning(f"写入Prometheus指标失败: {str(e)}")
@@ -0,0 +1,145 @@
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# 可选字段，为 None 时视为不存在（与原来的字典一致：没有这个键）
+_OPTIONAL_FIELDS = ('keywords', 'authors', 'categories', 'sources', 'duplicate_links')
+FIELDS = ('title', 'link', 'published', 'summary', 'source') + _OPTIONAL_FIELDS
+
+
+def _intern_all(values: Optional[List[str]]) -> Optional[List[str]]:
+    """来源名、作者、分类、关键词在大量新闻间重复，统一驻留为同一个字符串对象"""
+    if values is None:
+        return None
+    return [sys.intern(value) if type(value) is str else value for value in values]
+
+
+class NewsItem:
+    """一条新闻
+
+    用 __slots__ 代替字典保存字段，不再为每条新闻重复保存键名；来源名等
+    重复出现的字符串会被驻留。摘要保持为 str：中文摘要按 UTF-8 编码后
+    反而更大，而且去重、聚类、分类和模板都会反复读取摘要。
+    同时提供字典式的访问接口（item['title']、item.get('summary')、
+    dict(item)），原有按字典使用新闻的代码和模板无需修改。
+    不在 FIELDS 中的字段保存在 extra 字典里。
+    """
+
+    __slots__ = ('title', 'link', 'published', 'summary', 'source') + _OPTIONAL_FIELDS + ('extra',)
+
+    def __init__(self, title: str, link: str, published: Optional[datetime] = None, summary: str = '',
+                 source: str = '', keywords: Optional[List[str]] = None, authors: Optional[List[str]] = None,
+                 categories: Optional[List[str]] = None, sources: Optional[List[str]] = None,
+                 duplicate_links: Optional[List[str]] = None, **extra):
+        self.title = title
+        self.link = link
+        self.published = published
+        self.summary = summary or ''
+        self.source = sys.intern(source) if source else source
+        self.keywords = _intern_all(keywords)
+        self.authors = _intern_all(authors)
+        self.categories = _intern_all(categories)
+        self.sources = _intern_all(sources)
+        self.duplicate_links = duplicate_links
+        self.extra = extra or None
+
+    # ---- 字典接口 ----
+
+    def __getitem__(self, key: str) -> Any:
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is None and key in _OPTIONAL_FIELDS:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in FIELDS:
+            if key == 'source' and value:
+                value = sys.intern(value)
+            elif key in ('keywords', 'authors', 'categories', 'sources'):
+                value = _intern_all(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _OPTIONAL_FIELDS and getattr(self, key) is not None:
+            setattr(self, key, None)
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        keys = [key for key in FIELDS if key not in _OPTIONAL_FIELDS or getattr(self, key) is not None]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def copy(self) -> 'NewsItem':
+        item = NewsItem.__new__(NewsItem)
+        for slot in self.__slots__:
+            value = getattr(self, slot)
+            setattr(item, slot, value.copy() if isinstance(value, (list, dict)) else value)
+        return item
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (NewsItem, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"NewsItem(title={self.title!r}, source={self.source!r}, link={self.link!r})"
+
+    # ---- 转换 ----
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典（与原来的新闻格式相同）"""
+        return {key: self[key] for key in self.keys()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NewsItem':
+        """从字典创建新闻；published 可以是 datetime 或 ISO 格式的字符串"""
+        data = dict(data)
+        published = data.pop('published', None)
+        if isinstance(published, str):
+            published = datetime.fromisoformat(published)
+        return cls(data.pop('title'), data.pop('link'), published=published, **data)
+
+    def to_json(self) -> str:
+        data = self.to_dict()
+        if isinstance(data.get('published'), datetime):
+            data['published'] = data['published'].isoformat()
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'NewsItem':
+        return cls.from_dict(json.loads(text))
@@ -1,28 +1,97 @@
 import requests
-import feedparser
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta, timezone
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 import os
 import re
-import random
 import time
+import threading
 import urllib3
-from fake_useragent import UserAgent
-from ratelimit import limits, sleep_and_retry
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from urllib.parse import urlparse, urljoin
-from urllib.robotparser import RobotFileParser
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from rate_limiter import HostRateLimiter
+from robots_cache import RobotsPolicyCache
+from http_cache import HTTPCache, CachingHTTPAdapter
+from seen_store import SeenItemStore
+from dedup import collapse_duplicates
+from arxiv_harvester import ArxivHarvester
+from retry_policy import Deadline, DeadlineExceeded, RetryPolicy
+from circuit_breaker import CircuitBreaker, CircuitOpen, HALF_OPEN
+from date_utils import clamp_future, entry_published
+from feed_stream import iter_feed_entries
+from parse_pool import ParsePool, match_keywords, parse_entries
+from models import NewsItem
+from cassette import Cassette, CassetteAdapter, REPLAY, cassette_from_env
+from metrics import (RunMetrics, SourceMetrics, counted, current as current_metrics, install_connection_timing,
+                     recording, write_prometheus)
 
 # 禁用 SSL 警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class NewsCollector:
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 2,
+                 sources_path: str = 'config/news_sources.json', incremental: bool = False,
+                 seen_store_path: str = 'data/seen_items.db', early_stop_after: int = 3,
+                 html_backend: Optional[str] = None, retry_policy: Optional[RetryPolicy] = None,
+                 source_budget: Optional[float] = 120, run_budget: Optional[float] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, parse_workers: Optional[int] = None,
+                 max_pending_parses: Optional[int] = None, report_dir: Optional[str] = 'data/run_reports',
+                 prometheus_path: Optional[str] = 'data/metrics.prom', cassette_dir: Optional[str] = None,
+                 cassette_mode: str = REPLAY):
+        """初始化收集器
+
+        Args:
+            max_workers: 并发收集时的最大线程数
+            per_host_limit: 同一主机允许的最大并发请求数
+            sources_path: 新闻源配置文件路径
+            incremental: 是否增量收集，只返回之前没有收集过的新闻
+            seen_store_path: 增量收集使用的SQLite数据库路径
+            early_stop_after: 增量收集时连续遇到多少条早于高水位线的条目后停止遍历
+            html_backend: 网页解析后端（selectolax/lxml/html.parser），默认自动选择最快的可用后端
+            retry_policy: 请求的重试策略，默认最多尝试3次
+            source_budget: 每个新闻源（包括重试和备用源）的时间预算（秒），
+                可在新闻源配置中用 time_budget 覆盖；None 表示不限时
+            run_budget: 整次收集的时间预算（秒），到期后放弃未完成的新闻源，
+                返回已收集到的部分；None 表示不限时
+            circuit_breaker: 新闻源熔断器，默认把状态保存在 data/source_health.json
+            parse_workers: 解析订阅源和网页的进程数，默认为CPU核数（最多4个）；
+                0 或只有一个核时在抓取线程中直接解析
+            max_pending_parses: 同时等待解析的响应数上限，默认为进程数的2倍
+            report_dir: 每次收集的运行报告（JSON）保存目录，None 表示不保存
+            prometheus_path: 各新闻源最近一次收集指标的 Prometheus 文本文件，None 表示不写入
+            cassette_dir: 录制/回放HTTP响应的目录，默认读取环境变量 AI_BRIEF_CASSETTE；
+                None 且没有设置环境变量时正常访问网络
+            cassette_mode: 'record' 录制收到的响应，'replay' 只从磁带回放、不访问网络
+                （使用环境变量时由 AI_BRIEF_CASSETTE_MODE 指定）
+        """
         self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.html_backend = html_backend
+        self.source_budget = source_budget
+        self.run_budget = run_budget
+        # 当前线程正在收集的新闻源的截止时间
+        self._local = threading.local()
+        # 持续出错或解析不到内容的新闻源暂时跳过
+        self.breaker = circuit_breaker or CircuitBreaker()
+        # 每个主机一个信号量，限制对同一站点的并发请求
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        # 最近一次收集中各新闻源的状态
+        self.source_status = {}
+        # 运行指标：最近一次收集的 RunMetrics，以及每个新闻源最近一次被收集时的指标
+        self.report_dir = report_dir
+        self.prometheus_path = prometheus_path
+        self.last_run = None
+        self.latest_metrics: Dict[str, SourceMetrics] = {}
+        # 增量收集：已收集新闻的记录和各新闻源的高水位线
+        self.incremental = incremental
+        self.early_stop_after = early_stop_after
+        self.seen_store = SeenItemStore(seen_store_path) if incremental else None
+        self._marks = {}
+        self._newest_seen = {}
         # AI相关的关键词
         self.ai_keywords = [
             'AI model', 'LLM', 'Large Language Model', 'GPT', 'Claude', 'Gemini',
@@ -31,86 +100,52 @@ class NewsCollector:
             'transformer', 'diffusion model', 'stable diffusion', 'midjourney',
             'dall-e', 'sora', 'anthropic', 'openai', 'google ai', 'meta ai',
             'microsoft ai', 'amazon ai', 'apple ai',
-            # 中文关键词
-            '人工智能', 'AI模型', '大语言模型', 'GPT', 'Claude', 'Gemini',
+            # 中文关键词（与上面重复的英文专有名词不再列出）
+            '人工智能', 'AI模型', '大语言模型',
             'AI助手', 'AI聊天机器人', '机器学习', '深度学习', '神经网络',
-            'Transformer', '扩散模型', 'Stable Diffusion', 'Midjourney',
-            'DALL-E', 'Sora', 'Anthropic', 'OpenAI', '谷歌AI', 'Meta AI',
-            '微软AI', '亚马逊AI', '苹果AI'
+            '扩散模型', '谷歌AI', '微软AI', '亚马逊AI', '苹果AI'
         ]
-        # 新闻源配置
-        self.sources = {
-            'zdnet': {
-                'url': 'https://www.zdnet.com/topic/artificial-intelligence/',
-                'rss_url': 'https://www.zdnet.com/news/rss.xml',
-                'article_selector': 'article',
-                'title_selector': 'h3 a, h4 a',
-                'link_selector': 'h3 a, h4 a',
-                'date_selector': 'time',
-                'summary_selector': 'p.summary, p',
-                'request_interval': 5,  # 请求间隔（秒）
-                'max_requests_per_hour': 100  # 每小时最大请求数
-            },
-            'sina_tech': {
-                'url': 'https://tech.sina.com.cn/rollnews.shtml',  # 新浪科技滚动新闻
-                'article_selector': '.tech-news-item',
-                'title_selector': 'h2 a',
-                'link_selector': 'h2 a',
-                'date_selector': '.time',
-                'summary_selector': '.tech-news-item p',
-                'request_interval': 5,
-                'max_requests_per_hour': 100
-            },
-            'tencent_tech': {
-                'url': 'https://new.qq.com/ch2/tech',  # 腾讯科技频道
-                'article_selector': '.list .item',
-                'title_selector': '.title',
-                'link_selector': 'a',
-                'date_selector': '.time',
-                'summary_selector': '.detail',
-                'request_interval': 5,
-                'max_requests_per_hour': 100
-            },
-            '36kr': {
-                'url': 'https://36kr.com/information/ai',  # 36氪AI资讯
-                'article_selector': '.article-item',
-                'title_selector': '.title-wrapper',
-                'link_selector': 'a',
-                'date_selector': '.time-stamp',
-                'summary_selector': '.summary',
-                'request_interval': 5,
-                'max_requests_per_hour': 100
-            },
-            'theverge_ai': {
-                'url': 'https://www.theverge.com/artificial-intelligence-ai',
-                'article_selector': 'div.c-compact-river__entry',
-                'title_selector': 'h2.c-entry-box--compact__title a',
-                'link_selector': 'h2.c-entry-box--compact__title a',
-                'date_selector': 'time',
-                'summary_selector': 'p.p-dek',
-            },
-            'techcrunch_ai_rss': {
-                'rss_url': 'https://techcrunch.com/tag/artificial-intelligence/feed/'
-            },
-            'venturebeat_ai_rss': {
-                'rss_url': 'https://venturebeat.com/category/ai/feed/'
-            },
-        }
+        # 新闻源配置，从 config/news_sources.json 加载
+        self.sources_path = sources_path
+        self.sources = self._load_sources(sources_path)
+
+        if cassette_dir is None:
+            cassette_dir, env_mode = cassette_from_env()
+            cassette_mode = env_mode or cassette_mode
+        self.cassette_mode = cassette_mode if cassette_dir else None
+        replaying = self.cassette_mode == REPLAY
+
+        # 按主机限速，只约束真正的HTTP请求；回放磁带时不访问网络，也就不需要限速
+        if replaying:
+            self.rate_limiter = HostRateLimiter(default_interval=0, default_max_per_hour=10 ** 9)
+        else:
+            self.rate_limiter = HostRateLimiter(default_interval=1.0, default_max_per_hour=100)
+            for config in self.sources.values():
+                self.rate_limiter.configure(
+                    config['url'],
+                    request_interval=config.get('request_interval'),
+                    max_requests_per_hour=config.get('max_requests_per_hour')
+                )
         
-        # 初始化User-Agent生成器
-        self.ua = UserAgent()
+        # User-Agent生成器在第一次请求时才加载
+        self._ua = None
         
         # 初始化请求会话
         self.session = requests.Session()
         self.session.verify = False  # 禁用SSL验证
         
-        # 配置重试策略
-        retry_strategy = Retry(
-            total=3,  # 最大重试次数
-            backoff_factor=1,  # 重试间隔
-            status_forcelist=[500, 502, 503, 504]  # 需要重试的HTTP状态码
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # 重试只在 _make_request 中按 retry_policy 进行，适配器本身不再重试
+        self.retry_policy = retry_policy or RetryPolicy()
+        # 带条件请求（ETag / Last-Modified）的磁盘缓存
+        self.http_cache = HTTPCache()
+        adapter = CachingHTTPAdapter(self.http_cache, max_retries=0)
+        # 新建连接时记录DNS解析、TCP连接和TLS握手时间
+        install_connection_timing(adapter)
+        if self.cassette_mode:
+            # 录制时包装实际的适配器；回放时不使用条件请求缓存，结果只取决于磁带
+            adapter = CassetteAdapter(Cassette(cassette_dir), self.cassette_mode,
+                                      adapter=None if replaying else adapter)
+            self.logger.info(f"HTTP磁带模式: {self.cassette_mode} ({cassette_dir})")
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -121,512 +156,462 @@ class NewsCollector:
             'Upgrade-Insecure-Requests': '1',
         })
 
+        # 已解析的订阅源，服务器返回304时直接复用，跳过重复解析
+        self._parsed_feeds = {}
+
+        # robots.txt 策略缓存（按主机，带TTL并持久化到磁盘）
+        self.robots = RobotsPolicyCache(self.session, rate_limiter=self.rate_limiter)
+
+        # CPU密集的解析交给进程池，抓取线程可以继续发起请求
+        if parse_workers is None:
+            parse_workers = min(4, os.cpu_count() or 1)
+        self.parse_pool = ParsePool(parse_workers, max_pending_parses) if parse_workers > 1 else None
+
+        # 各类型新闻源的解析器，均返回统一格式的原始条目
+        self.parsers = {
+            'rss': self._parse_feed_entries,
+            'atom': self._parse_feed_entries,
+            'html': self._parse_html_entries,
+        }
+
+        # arXiv API 分页收集，中断后从游标处继续
+        self.arxiv_harvester = ArxivHarvester(self._make_request)
+
+    def _load_sources(self, path: str) -> Dict[str, Dict]:
+        """加载新闻源配置，返回按配置顺序排列的 {id: 配置}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        sources = {}
+        for source in config.get('sources', []):
+            if not source.get('url') or not source.get('type'):
+                self.logger.warning(f"新闻源配置缺少 url 或 type，已忽略: {source}")
+                continue
+            source_id = source.get('id') or re.sub(r'\W+', '_', source.get('name', source['url'])).strip('_').lower()
+            source = dict(source, id=source_id)
+            source.setdefault('name', source_id)
+            source.setdefault('enabled', True)
+            sources[source_id] = source
+        return sources
+
+    def enabled_sources(self) -> List[str]:
+        """返回所有启用的新闻源ID"""
+        return [source_id for source_id, source in self.sources.items() if source.get('enabled', True)]
+
+    @property
+    def ua(self):
+        """随机User-Agent生成器（fake_useragent 在第一次使用时导入）"""
+        if self._ua is None:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
+
     def _check_robots_txt(self, url: str) -> bool:
         """检查目标URL是否允许爬虫访问"""
         try:
-            parsed_url = urlparse(url)
-            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            return rp.can_fetch(self.ua.random, url)
+            return self.robots.can_fetch(url)
         except Exception as e:
             self.logger.warning(f"检查robots.txt失败: {str(e)}")
             return True  # 如果无法检查robots.txt，默认允许访问
 
-    def _random_delay(self, min_seconds=2, max_seconds=5):
-        """随机延迟，避免固定间隔请求"""
-        delay = random.uniform(min_seconds, max_seconds)
-        time.sleep(delay)
+    @contextmanager
+    def _host_slot(self, url: str):
+        """占用目标主机的一个并发名额"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+        with semaphore:
+            yield
+
+    def _deadline(self) -> Deadline:
+        """当前线程正在收集的新闻源的截止时间"""
+        return getattr(self._local, 'deadline', None) or Deadline()
+
+    def fetch(self, url: str, time_budget: Optional[float] = None, check_robots: bool = True,
+              use_cache: bool = True) -> requests.Response:
+        """在时间预算内请求任意URL，与收集新闻源共用会话、限速、robots.txt 和重试策略
 
-    @sleep_and_retry
-    @limits(calls=100, period=3600)  # 限制每小时最多100次请求
-    def _make_request(self, url: str, max_retries=3) -> requests.Response:
-        """发送HTTP请求，带有速率限制和随机User-Agent"""
+        use_cache 为 False 时不读写HTTP缓存（例如只抓取一次的文章页面）。
+        """
+        self._local.deadline = Deadline(time_budget)
+        try:
+            return self._make_request(url, headers=None if use_cache else {'Cache-Control': 'no-store'},
+                                      check_robots=check_robots)
+        finally:
+            self._local.deadline = None
+
+    def _make_request(self, url: str, params: Dict = None, headers: Dict = None,
+                      check_robots: bool = True, stream: bool = False) -> requests.Response:
+        """发送HTTP请求，带有按主机的速率限制和随机User-Agent
+
+        按 retry_policy 重试，所有等待和超时都不超过当前新闻源的时间预算。
+        """
+        deadline = self._deadline()
+        deadline.check(url)
         # 检查robots.txt
-        if not self._check_robots_txt(url):
+        if check_robots and not self._check_robots_txt(url):
             self.logger.warning(f"根据robots.txt规则，不允许访问: {url}")
             raise requests.exceptions.RequestException("Access denied by robots.txt")
 
-        headers = {
+        request_headers = {
             'User-Agent': self.ua.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',  # 添加中文语言支持
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
+        request_headers.update(headers or {})
+        # 没有在收集新闻源时（例如抓取文章原文）指标记录到一个丢弃的对象
+        metrics = current_metrics() or SourceMetrics(url)
         
-        for attempt in range(max_retries):
+        attempt = 0
+        while True:
             try:
-                response = self.session.get(url, headers=headers, timeout=30, verify=False)
+                if self.rate_limiter.acquire(url, max_wait=deadline.remaining()) is None:
+                    raise DeadlineExceeded(f"等待限速超出时间预算: {url}")
+                with self._host_slot(url):
+                    metrics.requests += 1
+                    start = time.perf_counter()
+                    try:
+                        response = self.session.get(url, params=params, headers=request_headers,
+                                                    timeout=deadline.timeout(self.retry_policy.request_timeout),
+                                                    verify=False, stream=stream)
+                    finally:
+                        metrics.total_time += time.perf_counter() - start
+                # elapsed 是发出请求到解析完响应头的时间
+                if getattr(response, 'elapsed', None) is not None:
+                    metrics.ttfb += response.elapsed.total_seconds()
+                if getattr(response, 'from_cache', False):
+                    metrics.cache_hits += 1
+                elif not stream:
+                    metrics.bytes += len(response.content)
                 response.raise_for_status()
                 return response
             except requests.exceptions.RequestException as e:
-                if attempt == max_retries - 1:
+                if getattr(self._local, 'probe', False) or not self.retry_policy.wait_before_retry(e, attempt, deadline):
                     raise
-                self.logger.warning(f"请求失败 (尝试 {attempt + 1}/{max_retries}): {str(e)}")
-                self._random_delay(2, 5)  # 在重试之前等待
+                attempt += 1
+                metrics.retries += 1
+                self.logger.warning(f"请求失败 (尝试 {attempt}/{self.retry_policy.max_attempts}): {str(e)}")
 
-    def _is_ai_related(self, title: str, summary: str) -> bool:
-        """检查新闻是否与AI相关"""
-        text = (title + ' ' + summary).lower()
-        return any(keyword.lower() in text for keyword in self.ai_keywords)
-
-    def _parse_date(self, date_str: str) -> datetime:
+    def _parse(self, kind: str, source: Dict, content, base_url: str) -> List[Dict]:
+        """解析响应内容；启用了解析进程池时在子进程中解析（解析时间包括排队等待）"""
+        start = time.perf_counter()
         try:
-            dt = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S%z')
-            return dt.astimezone(timezone.utc)
-        except ValueError:
-            return datetime.now(timezone.utc)
+            if self.parse_pool is not None:
+                return self.parse_pool.parse(kind, content, base_url, source, self.ai_keywords, self.html_backend)
+            return parse_entries(kind, content, base_url, source, self.ai_keywords, self.html_backend)
+        finally:
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.parse_time += time.perf_counter() - start
 
-    def _collect_from_zdnet_rss(self) -> List[Dict]:
-        """从ZDNet RSS源收集新闻"""
-        try:
-            self.logger.info("开始从ZDNet RSS源收集新闻...")
-            response = self._make_request(self.sources['zdnet']['rss_url'])
-            feed = feedparser.parse(response.content)
-            news_items = []
-            
-            for entry in feed.entries:
-                try:
-                    title = entry.title
-                    link = entry.link
-                    summary = entry.summary if hasattr(entry, 'summary') else ''
-                    date = self._parse_date(entry.published)
-                    
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': 'ZDNet AI (RSS)'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理RSS条目时出错: {str(e)}")
-                    continue
-                
-                # 添加随机延迟
-                self._random_delay(0.5, 1.5)
-            
-            self.logger.info(f"从ZDNet RSS源收集到 {len(news_items)} 条新闻")
-            return news_items
-        except Exception as e:
-            self.logger.error(f"从ZDNet RSS源收集新闻时出错: {str(e)}")
-            return []
+    def _match_keywords(self, title: str, summary: str) -> List[str]:
+        """返回新闻命中的AI关键词，没有命中时返回空列表（与解析进程中的过滤相同）"""
+        return match_keywords(title, summary, self.ai_keywords)
 
-    def _collect_from_zdnet(self) -> List[Dict]:
-        """从ZDNet收集新闻"""
-        try:
-            self.logger.info("开始从ZDNet收集新闻...")
-            
-            # 尝试加载页面
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    response = self._make_request(self.sources['zdnet']['url'])
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise
-                    self.logger.warning(f"加载页面失败 (尝试 {attempt + 1}/{max_retries}): {str(e)}")
-                    self._random_delay(2, 5)
-
-            # 等待页面加载
-            try:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                articles = soup.select(self.sources['zdnet']['article_selector'])
-            except Exception as e:
-                self.logger.warning("等待页面加载超时，尝试使用RSS源...")
-                return self._collect_from_zdnet_rss()
-            
-            # 获取所有新闻文章
-            news_items = []
-            for article in articles:
-                try:
-                    # 获取标题和链接
-                    title_element = None
-                    link_element = None
-                    for selector in self.sources['zdnet']['title_selector'].split(','):
-                        selector = selector.strip()
-                        try:
-                            title_element = article.find(selector)
-                            link_element = title_element
-                            if title_element and title_element.text.strip():
-                                break
-                        except Exception:
-                            continue
-                    if not title_element or not link_element:
-                        continue
-                    title = title_element.text.strip()
-                    link = link_element.get('href')
-
-                    # 获取摘要
-                    summary_element = None
-                    for selector in self.sources['zdnet']['summary_selector'].split(','):
-                        selector = selector.strip()
-                        try:
-                            summary_element = article.find(selector)
-                            if summary_element and summary_element.text.strip():
-                                break
-                        except Exception:
-                            continue
-                    summary = summary_element.text.strip() if summary_element else ''
-
-                    # 获取日期
-                    date_element = article.find(self.sources['zdnet']['date_selector'])
-                    date_str = date_element.get('datetime') if date_element else ''
-                    date = self._parse_date(date_str)
-                    
-                    # 只收集AI相关的新闻
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': 'ZDNet AI'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理文章时出错: {str(e)}")
-                    continue
-                
-                # 添加随机延迟
-                self._random_delay(0.5, 1.5)
-            
-            self.logger.info(f"从ZDNet收集到 {len(news_items)} 条新闻")
-            
-            # 如果没有收集到新闻，尝试使用RSS源
-            if not news_items:
-                self.logger.info("未从网页收集到新闻，尝试使用RSS源...")
-                return self._collect_from_zdnet_rss()
-            
-            return news_items
-        except Exception as e:
-            self.logger.error(f"从ZDNet收集新闻时出错: {str(e)}")
-            # 如果网页采集失败，尝试使用RSS源
-            self.logger.info("网页采集失败，尝试使用RSS源...")
-            return self._collect_from_zdnet_rss()
+    def _parse_date(self, source: Dict, entry: Dict) -> Optional[datetime]:
+        """解析原始条目的发布时间（UTC），无法解析时返回 None"""
+        return entry_published(source, entry)
 
-    def _collect_from_sina_tech(self) -> List[Dict]:
-        """从新浪科技收集新闻"""
-        try:
-            self.logger.info("开始从新浪科技收集新闻...")
-            response = self._make_request(self.sources['sina_tech']['url'])
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = soup.select(self.sources['sina_tech']['article_selector'])
-            
-            news_items = []
-            for article in articles:
-                try:
-                    title_element = article.select_one(self.sources['sina_tech']['title_selector'])
-                    if not title_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    link = title_element.get('href')
-                    if not link.startswith('http'):
-                        link = 'https:' + link
-                    
-                    summary_element = article.select_one(self.sources['sina_tech']['summary_selector'])
-                    summary = summary_element.text.strip() if summary_element else ''
-                    
-                    date_element = article.select_one(self.sources['sina_tech']['date_selector'])
-                    date_str = date_element.text.strip() if date_element else ''
-                    date = self._parse_date(date_str)
-                    
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': '新浪科技'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理新浪科技文章时出错: {str(e)}")
-                    continue
-                
-                self._random_delay(0.5, 1.5)
-            
-            self.logger.info(f"从新浪科技收集到 {len(news_items)} 条新闻")
-            return news_items
-        except Exception as e:
-            self.logger.error(f"从新浪科技收集新闻时出错: {str(e)}")
-            return []
+    def _fetch_source(self, source: Dict) -> requests.Response:
+        """按新闻源配置发送请求"""
+        return self._make_request(source['url'], check_robots=source.get('check_robots', True),
+                                  stream=self._is_streaming(source))
 
-    def _collect_from_tencent_tech(self) -> List[Dict]:
-        """从腾讯科技收集新闻"""
-        try:
-            self.logger.info("开始从腾讯科技收集新闻...")
-            response = self._make_request(self.sources['tencent_tech']['url'])
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = soup.select(self.sources['tencent_tech']['article_selector'])
-            
-            news_items = []
-            for article in articles:
-                try:
-                    title_element = article.select_one(self.sources['tencent_tech']['title_selector'])
-                    if not title_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    link = article.select_one(self.sources['tencent_tech']['link_selector'])['href']
-                    if not link.startswith('http'):
-                        link = 'https:' + link
-                    
-                    summary_element = article.select_one(self.sources['tencent_tech']['summary_selector'])
-                    summary = summary_element.text.strip() if summary_element else ''
-                    
-                    date_element = article.select_one(self.sources['tencent_tech']['date_selector'])
-                    date_str = date_element.text.strip() if date_element else ''
-                    date = self._parse_date(date_str)
-                    
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': '腾讯科技'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理腾讯科技文章时出错: {str(e)}")
-                    continue
-                
-                self._random_delay(0.5, 1.5)
-            
-            self.logger.info(f"从腾讯科技收集到 {len(news_items)} 条新闻")
-            return news_items
-        except Exception as e:
-            self.logger.error(f"从腾讯科技收集新闻时出错: {str(e)}")
-            return []
+    def _is_streaming(self, source: Dict) -> bool:
+        """订阅源是否使用流式解析（需要在配置中设置 "stream": true）"""
+        return bool(source.get('stream')) and source['type'] in ('rss', 'atom')
+
+    def _parse_feed_entries(self, source: Dict, response: requests.Response) -> List[Dict]:
+        """将RSS/Atom响应解析为原始条目；内容未变化（304）时复用上次的解析结果"""
+        url = response.url
+        if getattr(response, 'from_cache', False) and url in self._parsed_feeds:
+            self.logger.debug(f"订阅源未更新，跳过解析: {url}")
+            return self._parsed_feeds[url]
+        entries = self._parse('feed', source, response.content, url)
+        if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+            self._parsed_feeds[url] = entries
+        return entries
+
+    def _stream_feed_entries(self, source: Dict, response: requests.Response):
+        """边下载边解析订阅源，逐条产出原始条目；停止迭代时关闭连接
+
+        订阅源不是格式正确的XML时（在产出任何条目之前发现），改用 feedparser 解析完整内容。
+        """
+        def fallback(content: bytes) -> List[Dict]:
+            self.logger.warning(f"{source['name']}不是格式正确的XML，改用 feedparser 解析")
+            return self._parse('feed', source, content, response.url or source['url'])
 
-    def _collect_from_36kr(self) -> List[Dict]:
-        """从36氪收集新闻"""
         try:
-            self.logger.info("开始从36氪收集新闻...")
-            response = self._make_request(self.sources['36kr']['url'])
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = soup.select(self.sources['36kr']['article_selector'])
-            
-            news_items = []
-            for article in articles:
-                try:
-                    title_element = article.select_one(self.sources['36kr']['title_selector'])
-                    if not title_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    link = article.select_one(self.sources['36kr']['link_selector'])['href']
-                    if not link.startswith('http'):
-                        link = 'https://36kr.com' + link
-                    
-                    summary_element = article.select_one(self.sources['36kr']['summary_selector'])
-                    summary = summary_element.text.strip() if summary_element else ''
-                    
-                    date_element = article.select_one(self.sources['36kr']['date_selector'])
-                    date_str = date_element.text.strip() if date_element else ''
-                    date = self._parse_date(date_str)
-                    
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': '36氪'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理36氪文章时出错: {str(e)}")
-                    continue
-                
-                self._random_delay(0.5, 1.5)
-            
-            self.logger.info(f"从36氪收集到 {len(news_items)} 条新闻")
-            return news_items
-        except Exception as e:
-            self.logger.error(f"从36氪收集新闻时出错: {str(e)}")
-            return []
+            yield from iter_feed_entries(counted(response.iter_content(chunk_size=16 * 1024)), fallback)
+        finally:
+            response.close()
 
-    def _collect_from_theverge_ai(self) -> List[Dict]:
+    def _parse_html_entries(self, source: Dict, response: requests.Response) -> List[Dict]:
+        """按配置的CSS选择器将网页解析为原始条目"""
+        return self._parse('html', source, response.text, response.url or source['url'])
+
+    def _normalize(self, source: Dict, entry: Dict, published: datetime = None) -> NewsItem:
+        """将原始条目转换为统一的新闻格式"""
+        return NewsItem(
+            entry['title'],
+            entry['link'],
+            published=published or datetime.now(timezone.utc),
+            summary=entry.get('summary', ''),
+            source=source['name'],
+            authors=entry.get('authors') or None,
+            categories=entry.get('categories') or None
+        )
+
+    def collect_source(self, source_id: str) -> List[Dict]:
+        """从单个新闻源收集新闻：请求 → 解析 → 过滤 → 标准化
+
+        配置了 fallback 的新闻源在出错或没有结果时改用备用新闻源。
+        """
+        source = self.sources[source_id]
+        fallback = source.get('fallback')
+        # 早于截止时间的条目不再处理：增量模式的高水位线和配置的 max_age_hours 取较晚者
+        since = self._marks.get(source_id) if self.incremental else None
+        if source.get('max_age_hours'):
+            max_age_cutoff = datetime.now(timezone.utc) - timedelta(hours=source['max_age_hours'])
+            since = max(since, max_age_cutoff) if since else max_age_cutoff
+        circuit = self.breaker.allow(source_id)
+        if circuit is None:
+            if fallback:
+                self.logger.info(f"{source['name']}已熔断，直接使用备用源 {fallback}")
+                return self.collect_source(fallback)
+            raise CircuitOpen(f"{source['name']}已熔断，本次跳过")
+        # 半开状态只做一次快速探测：不重试，并使用较短的时间预算
+        probing = circuit == HALF_OPEN
+        if probing:
+            outer_deadline = getattr(self._local, 'deadline', None)
+            self._local.deadline = self._deadline().child(self.breaker.probe_budget)
+            self._local.probe = True
+            self.logger.info(f"探测已熔断的新闻源{source['name']}")
+
+        self.logger.info(f"开始从{source['name']}收集新闻...")
+        entries = None
+        entry_count = 0
+        failed = False
+        metrics = current_metrics() or SourceMetrics(source_id)
         try:
-            self.logger.info("开始从The Verge AI收集新闻...")
-            response = self._make_request(self.sources['theverge_ai']['url'])
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = soup.select(self.sources['theverge_ai']['article_selector'])
+            if source['type'] == 'arxiv':
+                entries = self.arxiv_harvester.harvest(source)
+            else:
+                if self._is_streaming(source):
+                    parser = self._stream_feed_entries
+                else:
+                    parser = self.parsers.get(source['type'])
+                if parser is None:
+                    raise ValueError(f"不支持的新闻源类型: {source['type']}")
+                entries = parser(source, self._fetch_source(source))
             news_items = []
-            for article in articles:
-                try:
-                    title_element = article.select_one(self.sources['theverge_ai']['title_selector'])
-                    if not title_element:
+            newest = None
+            older_streak = 0
+            deadline = self._deadline()
+            now = datetime.now(timezone.utc)
+            for entry in entries:
+                # 流式解析时数据可能源源不断，每条都检查时间预算
+                deadline.check(source['name'])
+                entry_count += 1
+                metrics.entries_seen += 1
+                self.logger.debug(f"{source['name']}原始标题: {entry['title']}")
+                # 在解析进程中已经计算过的发布时间和关键词直接使用
+                published = entry['published'] if 'published' in entry else self._parse_date(source, entry)
+                # 未来的发布时间会使高水位线超前，改为当前时间
+                published = clamp_future(published, now)
+                if published is not None:
+                    if newest is None or published > newest:
+                        newest = published
+                    if since is not None and published < since:
+                        # 订阅源按时间倒序排列，连续遇到旧条目后不再继续遍历（流式解析时也不再读取剩余数据）
+                        older_streak += 1
+                        metrics.entries_old += 1
+                        if older_streak >= self.early_stop_after:
+                            self.logger.debug(f"{source['name']}已到达截止时间，停止遍历")
+                            if source['type'] == 'arxiv':
+                                # 剩余的论文都早于截止时间，本轮收集已完成
+                                self.arxiv_harvester.complete(source['id'])
+                            break
                         continue
-                    title = title_element.text.strip()
-                    link = title_element.get('href')
-                    summary_element = article.select_one(self.sources['theverge_ai']['summary_selector'])
-                    summary = summary_element.text.strip() if summary_element else ''
-                    date_element = article.select_one(self.sources['theverge_ai']['date_selector'])
-                    date_str = date_element.get('datetime') if date_element else ''
-                    date = self._parse_date(date_str)
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': 'The Verge AI'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理The Verge文章时出错: {str(e)}")
-                    continue
-                self._random_delay(0.2, 0.6)
-            self.logger.info(f"从The Verge收集到 {len(news_items)} 条新闻")
-            return news_items
-        except Exception as e:
-            self.logger.error(f"从The Verge收集新闻时出错: {str(e)}")
-            return []
+                    older_streak = 0
 
-    def _collect_from_techcrunch_rss(self) -> List[Dict]:
-        try:
-            self.logger.info("开始从TechCrunch AI RSS收集新闻...")
-            response = self._make_request(self.sources['techcrunch_ai_rss']['rss_url'])
-            feed = feedparser.parse(response.content)
-            news_items = []
-            for entry in feed.entries:
-                try:
-                    title = entry.title
-                    link = entry.link
-                    summary = entry.summary if hasattr(entry, 'summary') else ''
-                    date = self._parse_date(entry.published) if hasattr(entry, 'published') else datetime.now()
-                    print(f"TechCrunch RSS原始标题: {title}")
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': 'TechCrunch AI (RSS)'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理TechCrunch RSS条目时出错: {str(e)}")
-                    continue
-                self._random_delay(0.2, 0.6)
-            self.logger.info(f"从TechCrunch RSS收集到 {len(news_items)} 条新闻")
-            return news_items
+                if 'keywords' in entry:
+                    keywords = entry['keywords']
+                else:
+                    keywords = self._match_keywords(entry['title'], entry.get('summary', ''))
+                # 按分类收集的 arXiv 论文本身就是AI相关的，可以配置 "keyword_filter": false 跳过关键词过滤
+                if keywords or not source.get('keyword_filter', True):
+                    item = self._normalize(source, entry, published)
+                    item['keywords'] = keywords
+                    news_items.append(item)
+                    metrics.entries_kept += 1
+                else:
+                    metrics.entries_filtered += 1
+            if source['type'] == 'arxiv' and self.arxiv_harvester.pending(source):
+                # 收集没有完成，剩余的论文比已收集的旧：高水位线前移后下次会被当作旧论文跳过
+                newest = None
+            self._newest_seen[source_id] = newest
         except Exception as e:
-            self.logger.error(f"从TechCrunch RSS收集新闻时出错: {str(e)}")
-            return []
+            self.breaker.record_failure(source_id, e)
+            # 探测超时只说明该新闻源仍然异常，备用源可以继续使用剩余的时间预算
+            if not fallback or (isinstance(e, DeadlineExceeded) and not probing):
+                raise
+            self.logger.error(f"从{source['name']}收集新闻时出错: {str(e)}，尝试使用备用源 {fallback}")
+            failed = True
+        finally:
+            # 提前停止时关闭流式解析器，不再读取剩余数据
+            if hasattr(entries, 'close'):
+                entries.close()
+            if probing:
+                self._local.deadline = outer_deadline
+                self._local.probe = False
+        if failed:
+            return self.collect_source(fallback)
 
-    def _collect_from_venturebeat_rss(self) -> List[Dict]:
-        try:
-            self.logger.info("开始从VentureBeat AI RSS收集新闻...")
-            response = self._make_request(self.sources['venturebeat_ai_rss']['rss_url'])
-            feed = feedparser.parse(response.content)
-            news_items = []
-            for entry in feed.entries:
-                try:
-                    title = entry.title
-                    link = entry.link
-                    summary = entry.summary if hasattr(entry, 'summary') else ''
-                    date = self._parse_date(entry.published) if hasattr(entry, 'published') else datetime.now()
-                    print(f"VentureBeat RSS原始标题: {title}")
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': 'VentureBeat AI (RSS)'
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理VentureBeat RSS条目时出错: {str(e)}")
-                    continue
-                self._random_delay(0.2, 0.6)
-            self.logger.info(f"从VentureBeat RSS收集到 {len(news_items)} 条新闻")
-            return news_items
-        except Exception as e:
-            self.logger.error(f"从VentureBeat RSS收集新闻时出错: {str(e)}")
-            return []
+        self.breaker.record_success(source_id, entry_count)
+        self.logger.info(f"从{source['name']}收集到 {len(news_items)} 条新闻")
+        if not news_items and fallback:
+            self.logger.info(f"未从{source['name']}收集到新闻，尝试使用备用源 {fallback}")
+            return self.collect_source(fallback)
+        return news_items
 
-    def _collect_from_arxiv(self, query="artificial intelligence", max_results=20) -> List[Dict]:
+    def _run_source(self, name: str, run_deadline: Deadline, run_metrics: RunMetrics):
+        """在时间预算内收集单个新闻源，返回 (新闻列表, 状态)"""
+        start = time.monotonic()
+        budget = self.sources[name].get('time_budget', self.source_budget)
+        self._local.deadline = run_deadline.child(budget)
         try:
-            self.logger.info("开始从arXiv API收集AI论文...")
-            # 使用官方API，添加适当的请求头
-            base_url = "http://export.arxiv.org/api/query"
-            params = {
-                'search_query': f'all:{query}',
-                'start': 0,
-                'max_results': max_results,
-                'sortBy': 'submittedDate',
-                'sortOrder': 'descending'
+            with recording(run_metrics.source(name)):
+                news = self.collect_source(name)
+            return news, {
+                'status': 'ok',
+                'count': len(news),
+                'elapsed': round(time.monotonic() - start, 3),
+                'error': None
             }
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (compatible; AI-Daily-Brief/1.0; +https://github.com/yourusername/ai-daily-brief)',
-                'Accept': 'application/xml',
-                'From': 'your-email@example.com'  # 建议替换为实际邮箱
+        except CircuitOpen as e:
+            self.logger.info(str(e))
+            return [], {
+                'status': 'skipped',
+                'count': 0,
+                'elapsed': round(time.monotonic() - start, 3),
+                'error': str(e)
             }
-            
-            response = self.session.get(
-                base_url,
-                params=params,
-                headers=headers,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.content)
-            news_items = []
-            
-            for entry in feed.entries:
-                try:
-                    title = entry.title
-                    link = entry.link
-                    summary = entry.summary if hasattr(entry, 'summary') else ''
-                    date = self._parse_date(entry.published) if hasattr(entry, 'published') else datetime.now()
-                    print(f"arXiv原始标题: {title}")
-                    
-                    # 添加更多元数据
-                    authors = [author.name for author in entry.authors] if hasattr(entry, 'authors') else []
-                    categories = [tag.term for tag in entry.tags] if hasattr(entry, 'tags') else []
-                    
-                    if self._is_ai_related(title, summary):
-                        news_items.append({
-                            'title': title,
-                            'link': link,
-                            'published': date,
-                            'summary': summary,
-                            'source': 'arXiv',
-                            'authors': authors,
-                            'categories': categories
-                        })
-                except Exception as e:
-                    self.logger.warning(f"处理arXiv条目时出错: {str(e)}")
-                    continue
-                
-                # 遵循arXiv API使用条款，每次请求后等待3秒
-                self._random_delay(3, 5)
-            
-            self.logger.info(f"从arXiv收集到 {len(news_items)} 条论文")
-            return news_items
         except Exception as e:
-            self.logger.error(f"从arXiv收集论文时出错: {str(e)}")
-            return []
+            self.logger.error(f"收集新闻时出错 ({name}): {str(e)}")
+            return [], {
+                'status': 'timeout' if isinstance(e, DeadlineExceeded) else 'error',
+                'count': 0,
+                'elapsed': round(time.monotonic() - start, 3),
+                'error': str(e)
+            }
+        finally:
+            self._local.deadline = None
+
+    def close(self):
+        """关闭解析进程池和增量收集的数据库"""
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        if self.seen_store is not None:
+            self.seen_store.close()
+
+    def health_report(self) -> List[Dict]:
+        """返回各新闻源熔断器的状态，异常的排在前面"""
+        return self.breaker.health_report()
+
+    def collect_all_news(self, concurrent: bool = True, dedup: bool = True,
+                         source_ids: Optional[List[str]] = None, keep_pending: bool = False) -> List[Dict]:
+        """从所有启用的新闻源收集新闻
+
+        Args:
+            concurrent: 是否并发收集各新闻源；并发时同一主机的请求数
+                仍受 per_host_limit 限制
+            dedup: 是否合并不同来源的重复和近似重复新闻，合并后的新闻
+                在 'sources' 中列出所有来源
+            source_ids: 只收集这些新闻源，默认为所有启用的新闻源
+            keep_pending: 增量模式下把新新闻同时保存为待发布（seen_store.pending_items），
+                发布成功前进程退出也不会丢失；发布后由调用方 remove_pending
 
-    def collect_all_news(self) -> List[Dict]:
+        Returns:
+            按发布时间倒序排列的新闻列表；增量模式下只包含之前没有收集过的新闻。
+            超出 run_budget 时只包含按时完成的新闻源，其余新闻源在
+            source_status 中标记为 timeout
+        """
+        sources = list(source_ids) if source_ids is not None else self.enabled_sources()
+        self._newest_seen = {}
+        if self.incremental:
+            self._marks = self.seen_store.high_water_marks()
+        run_deadline = Deadline(self.run_budget)
+        run_metrics = RunMetrics()
+
+        results = {}
+        if concurrent and len(sources) > 1:
+            workers = max(1, min(self.max_workers, len(sources)))
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='collector')
+            futures = {executor.submit(self._run_source, name, run_deadline, run_metrics): name for name in sources}
+            done, not_done = wait(futures, timeout=run_deadline.remaining())
+            for future in done:
+                results[futures[future]] = future.result()
+            # 不等待未完成的新闻源：尚未开始的直接取消，正在进行的会在下一次检查截止时间时退出
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for name in sources:
+                results[name] = self._run_source(name, run_deadline, run_metrics)
+
+        self.source_status = {}
         all_news = []
-        sources = [
-            self._collect_from_arxiv,
-            self._collect_from_techcrunch_rss,
-            # self._collect_from_venturebeat_rss  # 暂时注释掉VentureBeat采集
-        ]
-        for source_func in sources:
-            try:
-                news = source_func()
-                all_news.extend(news)
-                self._random_delay(1, 2)
-            except Exception as e:
-                self.logger.error(f"收集新闻时出错: {str(e)}")
+        # 按新闻源的声明顺序合并结果，保证输出稳定
+        for name in sources:
+            if name not in results:
+                self.logger.error(f"收集新闻超时 ({name})，已放弃")
+                self.source_status[name] = {
+                    'status': 'timeout',
+                    'count': 0,
+                    'elapsed': None,
+                    'error': '超出本次运行的时间预算'
+                }
                 continue
+            news, status = results[name]
+            self.source_status[name] = status
+            all_news.extend(news)
+
+        if self.incremental:
+            all_news = self.seen_store.filter_new(all_news)
+            self.seen_store.record(all_news, pending=keep_pending)
+            # 超时放弃的新闻源可能在之后才完成，它们的高水位线不能前移
+            finished = set()
+            for name in results:
+                while name and name not in finished:
+                    finished.add(name)
+                    name = self.sources[name].get('fallback')
+            for source_id, newest in list(self._newest_seen.items()):
+                if source_id in finished:
+                    self.seen_store.update_mark(source_id, newest)
+            self.logger.info(f"增量收集：本次共有 {len(all_news)} 条新新闻")
+
+        if dedup:
+            total = len(all_news)
+            all_news = collapse_duplicates(all_news)
+            if len(all_news) < total:
+                self.logger.info(f"合并了 {total - len(all_news)} 条重复新闻")
+
         all_news.sort(key=lambda x: x['published'], reverse=True)
-        return all_news 
\ No newline at end of file
+        self._record_run(run_metrics, len(all_news))
+        return all_news
+
+    def _record_run(self, run_metrics: RunMetrics, items: int):
+        """保存本次收集的运行报告，并更新各新闻源最近一次的指标"""
+        run_metrics.finish(self.source_status, items)
+        self.last_run = run_metrics
+        self.latest_metrics.update(run_metrics.sources)
+        if self.report_dir:
+            path = run_metrics.write_report(self.report_dir)
+            if path:
+                self.logger.info(f"运行报告已保存: {path}")
+        if self.prometheus_path:
+            write_prometheus(self.latest_metrics, self.prometheus_path)
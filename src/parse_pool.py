@@ -0,0 +1,173 @@
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urljoin
+
+from date_utils import entry_published
+from html_parser import select_articles
+from keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# 以下解析函数都是模块级函数，可以在子进程中执行；参数和返回值只包含可序列化的基本类型
+
+
+def parse_feed_content(content: bytes, source: Dict) -> List[Dict]:
+    """将RSS/Atom响应内容解析为原始条目"""
+    import feedparser
+
+    feed = feedparser.parse(content)
+    entries = []
+    for entry in feed.entries:
+        try:
+            entries.append({
+                'title': entry.title,
+                'link': entry.link,
+                'summary': entry.summary if hasattr(entry, 'summary') else '',
+                'date': entry.published if hasattr(entry, 'published') else '',
+                'published_parsed': entry.get('published_parsed') or entry.get('updated_parsed'),
+                'authors': [author.name for author in entry.authors if 'name' in author] if hasattr(entry, 'authors') else [],
+                'categories': [tag.term for tag in entry.tags] if hasattr(entry, 'tags') else []
+            })
+        except Exception as e:
+            logger.warning(f"处理{source['name']}条目时出错: {str(e)}")
+    return entries
+
+
+def _select_first(element, selectors: str):
+    """依次尝试逗号分隔的选择器，返回第一个有文本的元素"""
+    for selector in selectors.split(','):
+        selector = selector.strip()
+        if not selector:
+            continue
+        found = element.select_one(selector)
+        if found and found.text.strip():
+            return found
+    return None
+
+
+def parse_html_content(html: str, base_url: str, source: Dict, backend: Optional[str] = None) -> List[Dict]:
+    """按配置的CSS选择器将网页解析为原始条目"""
+    entries = []
+    for article in select_articles(html, source['article_selector'], backend=source.get('html_backend', backend)):
+        try:
+            title_element = _select_first(article, source['title_selector'])
+            if not title_element:
+                continue
+            link_element = _select_first(article, source.get('link_selector') or source['title_selector'])
+            link = (link_element or title_element).get('href')
+            if not link:
+                continue
+
+            summary_element = None
+            if source.get('summary_selector'):
+                summary_element = _select_first(article, source['summary_selector'])
+
+            date_str = ''
+            date_element = article.select_one(source['date_selector']) if source.get('date_selector') else None
+            if date_element:
+                if source.get('date_attribute'):
+                    date_str = date_element.get(source['date_attribute']) or ''
+                else:
+                    date_str = date_element.text.strip()
+
+            entries.append({
+                'title': title_element.text.strip(),
+                'link': urljoin(base_url, link),
+                'summary': summary_element.text.strip() if summary_element else '',
+                'date': date_str
+            })
+        except Exception as e:
+            logger.warning(f"处理{source['name']}文章时出错: {str(e)}")
+    return entries
+
+
+@lru_cache(maxsize=8)
+def _matcher(keywords: tuple) -> KeywordMatcher:
+    # 每个进程只编译一次关键词
+    return KeywordMatcher(keywords)
+
+
+def match_keywords(title: str, summary: str, keywords: Sequence[str]) -> List[str]:
+    """返回标题和摘要命中的AI关键词，没有命中时返回空列表"""
+    return _matcher(tuple(keywords)).find_all(f"{title} {summary}")
+
+
+def parse_entries(kind: str, content, base_url: str, source: Dict, keywords: Sequence[str] = (),
+                  html_backend: Optional[str] = None) -> List[Dict]:
+    """解析响应内容，并为每个条目补充 published（UTC时间或 None）和 keywords
+
+    Args:
+        kind: 'feed' 或 'html'
+        content: 订阅源的原始字节，或网页的文本
+        base_url: 网页中相对链接的基准URL
+        source: 新闻源配置
+        keywords: AI关键词
+        html_backend: 默认的网页解析后端
+    """
+    if kind == 'feed':
+        entries = parse_feed_content(content, source)
+    else:
+        entries = parse_html_content(content, base_url, source, html_backend)
+
+    keywords = tuple(keywords)
+    for entry in entries:
+        entry['published'] = entry_published(source, entry)
+        entry['keywords'] = match_keywords(entry['title'], entry.get('summary', ''), keywords)
+    return entries
+
+
+class ParsePool:
+    """解析进程池
+
+    抓取线程拿到响应后把原始内容交给进程池解析，自己继续发起下一个请求，
+    CPU密集的解析因此可以利用多个核并与网络等待重叠。同时等待解析的响应
+    不超过 max_pending 个：队列满时提交方阻塞，内存占用不随新闻源数量增长。
+    """
+
+    def __init__(self, workers: int, max_pending: Optional[int] = None):
+        """初始化进程池（子进程在第一次提交时才启动）
+
+        Args:
+            workers: 解析进程数
+            max_pending: 同时排队和正在解析的响应数上限，默认为进程数的2倍
+        """
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # 进程池在收集线程中按需创建，此时其他线程可能持有锁（如 logging 的锁）；
+                # fork 出的子进程会继承这些锁而死锁，因此从干净的 forkserver 进程启动子进程；
+                # Windows 不支持 forkserver，改用 spawn
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context(method))
+            return self._executor
+
+    def parse(self, kind: str, content, base_url: str, source: Dict, keywords: Sequence[str] = (),
+              html_backend: Optional[str] = None) -> List[Dict]:
+        """在子进程中执行 parse_entries 并等待结果"""
+        self._slots.acquire()
+        try:
+            future = self._get_executor().submit(parse_entries, kind, content, base_url, source,
+                                                 tuple(keywords), html_backend)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
@@ -1,20 +1,19 @@
-import tweepy
 import logging
-from typing import Dict
+from typing import Dict, Optional
 import os
 import json
 from datetime import datetime
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import git
 import shutil
 
 class Publisher:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self._load_config()
-        self._setup_twitter()
+        # Twitter客户端在第一次发布时才创建（tweepy 和 GitPython 也只在用到时导入）
+        self.twitter_client = None
 
     def _load_config(self):
         """加载配置文件"""
@@ -27,6 +26,8 @@ class Publisher:
 
     def _setup_twitter(self):
         """设置Twitter API配置"""
+        import tweepy
+
         twitter_config = self.config.get('twitter', {})
         self.twitter_client = tweepy.Client(
             consumer_key=twitter_config.get('consumer_key'),
@@ -47,6 +48,8 @@ class Publisher:
     def post_to_twitter(self, content: str) -> bool:
         """发布到Twitter"""
         try:
+            if self.twitter_client is None:
+                self._setup_twitter()
             # 将内容分成多条推文
             lines = content.split('\n')
             tweets = []
@@ -116,6 +119,8 @@ class Publisher:
     def deploy_to_github_pages(self, html_file_path: str) -> bool:
         """部署到GitHub Pages"""
         try:
+            import git
+
             github_config = self.config.get('github_pages', {})
             repo_url = github_config.get('repo_url')
             branch = github_config.get('branch', 'gh-pages')
@@ -179,8 +184,11 @@ class Publisher:
             self.logger.error(f"部署到GitHub Pages时出错: {str(e)}")
             return False
 
-    def publish_brief(self, brief_content: str, summary: str, html_file_path: str = None) -> Dict[str, bool]:
-        """发布简报到多个渠道"""
+    def publish_brief(self, brief_content: Optional[str], summary: str, html_file_path: str = None) -> Dict[str, bool]:
+        """发布简报到多个渠道
+
+        brief_content 为 None 时，只有发送邮件才从 html_file_path 读取完整简报。
+        """
         results = {
             'twitter': False,
             'email': False,
@@ -197,7 +205,10 @@ class Publisher:
         email_config = self.config.get('email', {})
         if email_config.get('sender_email'):
             subject = f"🤖 AI Daily Brief - {datetime.now().strftime('%Y-%m-%d')}"
-            results['email'] = self.send_email(subject, brief_content)
+            if brief_content is None and html_file_path:
+                with open(html_file_path, 'r', encoding='utf-8') as f:
+                    brief_content = f.read()
+            results['email'] = self.send_email(subject, brief_content or '')
 
         # 部署到GitHub Pages
         github_config = self.config.get('github_pages', {})
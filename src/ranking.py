@@ -0,0 +1,101 @@
+import heapq
+import math
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Mapping, Optional, Sequence
+
+# 计算排序键时使用的固定时间原点（只影响数值大小，不影响排序）
+_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class RankingEngine:
+    """新闻重要性排序
+
+    得分 = 来源权重 × 时间衰减 × 多来源加成 × 关键词加成：
+    - 时间衰减：每过 half_life_hours 小时得分减半
+    - 来源权重：新闻源配置中的 weight（默认1），合并后的新闻取各来源的最大值
+    - 多来源加成：被 n 个来源报道时乘以 1 + mention_weight × log2(n)
+    - 关键词加成：命中 k 个AI关键词时乘以 1 + keyword_weight × min(k, 3) / 3
+
+    时间衰减对所有新闻按相同比例变化，不改变新闻之间的先后，因此排序键
+    log2(得分) 加上当前时间项后是一个与当前时间无关的常数。排序键按链接
+    缓存，新新闻到达后只需计算新增的新闻；来源数或关键词变化时重新计算。
+    取前 k 条用堆选择，复杂度为 O(n log k)。
+    """
+
+    def __init__(self, source_weights: Optional[Mapping[str, float]] = None, half_life_hours: float = 12,
+                 mention_weight: float = 0.5, keyword_weight: float = 0.3, cache_size: int = 200000):
+        """初始化排序引擎
+
+        Args:
+            source_weights: {来源名称: 权重}，没有列出的来源权重为1
+            half_life_hours: 得分减半所需的小时数
+            mention_weight: 多来源加成的系数
+            keyword_weight: 关键词加成的系数
+            cache_size: 最多缓存多少条新闻的排序键
+        """
+        self.source_weights = dict(source_weights or {})
+        self.half_life_hours = half_life_hours
+        self.mention_weight = mention_weight
+        self.keyword_weight = keyword_weight
+        self.cache_size = cache_size
+        # 链接 -> (来源数, 关键词数, 排序键)
+        self._cache: 'OrderedDict[str, tuple]' = OrderedDict()
+
+    @classmethod
+    def from_sources(cls, sources: Mapping[str, Mapping], **kwargs) -> 'RankingEngine':
+        """用新闻源配置（NewsCollector.sources）中的 weight 创建排序引擎"""
+        weights = {source['name']: float(source['weight']) for source in sources.values() if 'weight' in source}
+        return cls(weights, **kwargs)
+
+    def _static_score(self, item: Mapping) -> float:
+        """与时间无关的部分：来源权重 × 多来源加成 × 关键词加成"""
+        sources = item.get('sources') or [item.get('source')]
+        weight = max((self.source_weights.get(source, 1.0) for source in sources), default=1.0)
+        mentions = 1 + self.mention_weight * math.log2(max(1, len(sources)))
+        keywords = 1 + self.keyword_weight * min(len(item.get('keywords') or ()), 3) / 3
+        return weight * mentions * keywords
+
+    def _key(self, item: Mapping) -> float:
+        """排序键：log2(得分) + 当前时间 / 半衰期，与当前时间无关"""
+        link = item.get('link')
+        mentions = len(item.get('sources') or ()) or 1
+        keywords = len(item.get('keywords') or ())
+        cached = self._cache.get(link) if link else None
+        if cached is not None and cached[0] == mentions and cached[1] == keywords:
+            self._cache.move_to_end(link)
+            return cached[2]
+
+        static = self._static_score(item)
+        published = item.get('published')
+        if isinstance(published, datetime):
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            hours = (published - _EPOCH).total_seconds() / 3600
+        else:
+            # 没有发布时间的新闻排在最后
+            hours = -1e9
+        key = (math.log2(static) if static > 0 else -1e9) + hours / self.half_life_hours
+        if link:
+            self._cache[link] = (mentions, keywords, key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return key
+
+    def score(self, item: Mapping, now: Optional[datetime] = None) -> float:
+        """新闻在 now（默认当前时间）的得分，刚发布的新闻得分等于与时间无关的部分"""
+        now = now or datetime.now(timezone.utc)
+        now_hours = (now - _EPOCH).total_seconds() / 3600
+        return 2 ** (self._key(item) - now_hours / self.half_life_hours)
+
+    def top(self, news_items: Sequence[Mapping], k: int) -> List[Mapping]:
+        """返回得分最高的 k 条新闻（按得分从高到低）"""
+        return heapq.nlargest(k, news_items, key=self._key)
+
+    def rank(self, news_items: Sequence[Mapping]) -> List[Mapping]:
+        """按得分从高到低排列全部新闻"""
+        return sorted(news_items, key=self._key, reverse=True)
+
+    def scores(self, news_items: Sequence[Mapping], now: Optional[datetime] = None) -> Dict[str, float]:
+        """返回 {链接: 得分}，用于调试权重"""
+        return {item.get('link'): self.score(item, now) for item in news_items}
@@ -0,0 +1,109 @@
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """单个主机的令牌桶
+
+    同时保证两次请求之间的最小间隔（request_interval）和每小时的请求上限
+    （max_requests_per_hour）。令牌不足时预约下一个可用时间点，因此并发的
+    调用方会依次排队，而不是同时醒来。
+    """
+
+    def __init__(self, request_interval: float, max_requests_per_hour: int):
+        self.request_interval = max(0.0, float(request_interval))
+        self.capacity = max(1, int(max_requests_per_hour))
+        self.rate = self.capacity / 3600.0  # 每秒补充的令牌数
+        self.tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """预约一次请求，返回需要等待的秒数；需要等待超过 max_wait 秒时不预约，返回 None"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+
+            wait = max(0.0, self._next_allowed - now)
+            if self.tokens < 1:
+                # 令牌欠账，按补充速率计算还需等待多久
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= 1
+
+            self._next_allowed = now + wait + self.request_interval
+            return wait
+
+
+class HostRateLimiter:
+    """按主机划分的请求调度器
+
+    每个主机拥有独立的令牌桶，只在真正发出HTTP请求前调用 acquire()，
+    解析响应内容时不再有任何等待。
+    """
+
+    def __init__(self, default_interval: float = 1.0, default_max_per_hour: int = 100):
+        self.logger = logging.getLogger(__name__)
+        self.default_interval = default_interval
+        self.default_max_per_hour = default_max_per_hour
+        self._limits: Dict[str, Dict] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url_or_host: str) -> str:
+        netloc = urlparse(url_or_host).netloc
+        return (netloc or url_or_host).lower()
+
+    def configure(self, url_or_host: str, request_interval: Optional[float] = None,
+                  max_requests_per_hour: Optional[int] = None):
+        """为主机设置限速参数；同一主机多次配置时取最严格的值"""
+        host = self._host(url_or_host)
+        with self._lock:
+            limits = self._limits.setdefault(host, {
+                'request_interval': None,
+                'max_requests_per_hour': None
+            })
+            if request_interval is not None:
+                current = limits['request_interval']
+                limits['request_interval'] = request_interval if current is None else max(current, request_interval)
+            if max_requests_per_hour is not None:
+                current = limits['max_requests_per_hour']
+                limits['max_requests_per_hour'] = (max_requests_per_hour if current is None
+                                                   else min(current, max_requests_per_hour))
+            # 参数变化后重建令牌桶
+            self._buckets.pop(host, None)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limits = self._limits.get(host, {})
+                interval = limits.get('request_interval')
+                per_hour = limits.get('max_requests_per_hour')
+                bucket = TokenBucket(
+                    self.default_interval if interval is None else interval,
+                    self.default_max_per_hour if per_hour is None else per_hour
+                )
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str, max_wait: Optional[float] = None) -> Optional[float]:
+        """在向 url 发送请求前调用，必要时阻塞，返回实际等待的秒数
+
+        需要等待超过 max_wait 秒时（例如剩余的时间预算不够）不会预约，返回 None。
+        """
+        host = self._host(url)
+        wait = self._bucket(host).reserve(max_wait)
+        if wait is None:
+            return None
+        if wait > 0:
+            self.logger.debug(f"等待 {wait:.2f} 秒后请求 {host}")
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,108 @@
+import random
+import time
+from typing import Optional
+
+import requests
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """时间预算已用完"""
+
+
+class Deadline:
+    """截止时间，seconds 为 None 时不限时
+
+    每个新闻源的截止时间由整次运行的截止时间派生（child），
+    取两者中较早的一个。
+    """
+
+    def __init__(self, seconds: Optional[float] = None, _expires_at: Optional[float] = None):
+        if _expires_at is not None:
+            self.expires_at = _expires_at
+        else:
+            self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def child(self, seconds: Optional[float]) -> 'Deadline':
+        """派生一个不晚于当前截止时间的子截止时间"""
+        if seconds is None:
+            return Deadline(_expires_at=self.expires_at)
+        expires_at = time.monotonic() + seconds
+        if self.expires_at is not None:
+            expires_at = min(expires_at, self.expires_at)
+        return Deadline(_expires_at=expires_at)
+
+    def remaining(self) -> Optional[float]:
+        """剩余秒数，不限时返回 None"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, what: str = ''):
+        """截止时间已过时抛出 DeadlineExceeded"""
+        if self.expired():
+            raise DeadlineExceeded(f"超出时间预算{f' ({what})' if what else ''}")
+
+    def timeout(self, default: float) -> float:
+        """单次请求的超时时间：不超过剩余时间"""
+        remaining = self.remaining()
+        return default if remaining is None else max(0.1, min(default, remaining))
+
+
+class RetryPolicy:
+    """统一的重试策略
+
+    只在 _make_request 一层重试（适配器本身不再重试），连接错误、超时和
+    retry_statuses 中的状态码才会重试，其他错误（如404、robots.txt 禁止）
+    直接失败。退避时间为指数增长加随机抖动；剩余时间不够退避时不再重试。
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 1.0, backoff_max: float = 10.0,
+                 retry_statuses=(429, 500, 502, 503, 504), request_timeout: float = 30):
+        """初始化重试策略
+
+        Args:
+            max_attempts: 每个请求最多尝试的次数（包括第一次）
+            backoff_base: 第一次重试前的等待时间（秒），之后每次翻倍
+            backoff_max: 单次等待的上限（秒）
+            retry_statuses: 需要重试的HTTP状态码
+            request_timeout: 单次请求的超时时间（秒），不会超过剩余的时间预算
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.request_timeout = request_timeout
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, DeadlineExceeded):
+            return False
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            return response is not None and response.status_code in self.retry_statuses
+        return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                                  requests.exceptions.ChunkedEncodingError))
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """第 attempt 次失败（从0开始）后的等待时间；服务器给出 Retry-After 时优先使用"""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def wait_before_retry(self, error: Exception, attempt: int, deadline: Deadline) -> bool:
+        """判断是否重试，需要重试时等待退避时间并返回 True"""
+        if attempt + 1 >= self.max_attempts or not self.is_retryable(error):
+            return False
+        retry_after = None
+        response = getattr(error, 'response', None)
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            retry_after = float(response.headers['Retry-After'])
+        delay = self.backoff(attempt, retry_after)
+        remaining = deadline.remaining()
+        if remaining is not None and delay >= remaining:
+            return False
+        time.sleep(delay)
+        return True
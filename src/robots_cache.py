@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+# 固定的爬虫标识：robots.txt 规则始终按这个UA判断，保证每次运行结果一致
+CRAWLER_NAME = 'AI-Daily-Brief'
+CRAWLER_USER_AGENT = 'Mozilla/5.0 (compatible; AI-Daily-Brief/1.0; +https://github.com/yourusername/ai-daily-brief)'
+
+
+class RobotsPolicyCache:
+    """按主机缓存的 robots.txt 策略
+
+    每个主机的 robots.txt 只下载一次，在 TTL 内复用，并持久化到磁盘，
+    进程重启后无需重新下载。如果规则中带有 Crawl-delay，会同步到限速器。
+    """
+
+    def __init__(self, session, cache_path: str = 'data/robots_cache.json', ttl: int = 24 * 3600,
+                 error_ttl: int = 3600, rate_limiter=None, timeout: int = 10):
+        """初始化缓存
+
+        Args:
+            session: 用于下载 robots.txt 的 requests 会话
+            cache_path: 磁盘缓存文件路径，为 None 时只在内存中缓存
+            ttl: 成功获取的规则的有效期（秒）
+            error_ttl: 获取失败时"默认允许"结果的有效期（秒）
+            rate_limiter: 可选的 HostRateLimiter，用于应用 Crawl-delay
+            timeout: 下载 robots.txt 的超时时间（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.session = session
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self._entries: Dict[str, Dict] = {}
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._load()
+
+    def _load(self):
+        """从磁盘加载缓存"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"加载robots.txt缓存失败: {str(e)}")
+            self._entries = {}
+
+    def _save(self):
+        """将缓存写回磁盘"""
+        if not self.cache_path:
+            return
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            self.logger.warning(f"保存robots.txt缓存失败: {str(e)}")
+
+    def _host_lock(self, origin: str) -> threading.Lock:
+        with self._lock:
+            lock = self._host_locks.get(origin)
+            if lock is None:
+                lock = self._host_locks[origin] = threading.Lock()
+            return lock
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        ttl = self.error_ttl if entry.get('status') is None else self.ttl
+        return time.time() - entry.get('fetched_at', 0) < ttl
+
+    def _fetch(self, origin: str) -> Dict:
+        """下载并返回某个主机的 robots.txt 记录"""
+        robots_url = f"{origin}/robots.txt"
+        try:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(robots_url)
+            response = self.session.get(
+                robots_url,
+                headers={'User-Agent': CRAWLER_USER_AGENT},
+                timeout=self.timeout
+            )
+            return {
+                'fetched_at': time.time(),
+                'status': response.status_code,
+                'lines': response.text.splitlines() if response.status_code < 400 else []
+            }
+        except Exception as e:
+            self.logger.warning(f"检查robots.txt失败: {str(e)}")
+            return {'fetched_at': time.time(), 'status': None, 'lines': []}
+
+    def _build_parser(self, origin: str, entry: Dict) -> RobotFileParser:
+        """按照 RobotFileParser.read() 的规则根据状态码构建解析器"""
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        status = entry.get('status')
+        if status in (401, 403):
+            parser.disallow_all = True
+        elif status is None or status >= 400:
+            # 获取失败或不存在时默认允许访问
+            parser.allow_all = True
+        else:
+            parser.parse(entry.get('lines', []))
+
+        delay = parser.crawl_delay(CRAWLER_NAME)
+        if delay and self.rate_limiter:
+            self.rate_limiter.configure(origin, request_interval=float(delay))
+        return parser
+
+    def _parser(self, url: str) -> RobotFileParser:
+        parsed_url = urlparse(url)
+        origin = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        parser = self._parsers.get(origin)
+        entry = self._entries.get(origin)
+        if parser is not None and entry is not None and self._is_fresh(entry):
+            return parser
+
+        with self._host_lock(origin):
+            entry = self._entries.get(origin)
+            if entry is None or not self._is_fresh(entry):
+                entry = self._fetch(origin)
+                with self._lock:
+                    self._entries[origin] = entry
+                    self._save()
+                self._parsers.pop(origin, None)
+            parser = self._parsers.get(origin)
+            if parser is None:
+                parser = self._parsers[origin] = self._build_parser(origin, entry)
+            return parser
+
+    def can_fetch(self, url: str) -> bool:
+        """判断固定爬虫标识是否允许抓取 url"""
+        return self._parser(url).can_fetch(CRAWLER_NAME, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """返回目标主机为本爬虫设置的 Crawl-delay（秒）"""
+        delay = self._parser(url).crawl_delay(CRAWLER_NAME)
+        return float(delay) if delay is not None else None
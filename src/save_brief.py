@@ -74,7 +74,8 @@ def save_as_json(news_items, output_dir='briefs'):
     filepath = os.path.join(output_dir, filename)
     
     with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(news_items, f, ensure_ascii=False, indent=2, default=datetime_handler)
+        # NewsItem 先转换为普通字典
+        json.dump([dict(item) for item in news_items], f, ensure_ascii=False, indent=2, default=datetime_handler)
     
     logger.info(f"JSON 数据已保存到: {filepath}")
     return filepath
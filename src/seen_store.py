@@ -0,0 +1,153 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from date_utils import clamp_future
+from models import NewsItem
+from url_utils import canonicalize_url
+
+
+class SeenItemStore:
+    """已收集新闻的持久化记录（SQLite）
+
+    seen_items 记录每条新闻的ID（规范化后的链接），source_marks 记录每个
+    新闻源已见过的最新发布时间（高水位线）。增量收集时据此只返回新条目，
+    并在订阅源遍历到高水位线之前的条目时提前停止。
+    pending_items 保存已收集、尚未发布的新闻（常驻模式），进程重启后
+    不会因为已记录为见过而丢失。
+    """
+
+    def __init__(self, db_path: str = 'data/seen_items.db'):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS seen_items (
+                    item_id TEXT PRIMARY KEY,
+                    source TEXT,
+                    title TEXT,
+                    published TEXT,
+                    first_seen TEXT
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS source_marks (
+                    source_id TEXT PRIMARY KEY,
+                    last_published TEXT,
+                    updated_at TEXT
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS pending_items (
+                    item_id TEXT PRIMARY KEY,
+                    data TEXT,
+                    added_at TEXT
+                )"""
+            )
+
+    @staticmethod
+    def item_id(item: Dict) -> str:
+        """新闻的唯一ID：规范化后的链接"""
+        return canonicalize_url(item['link'])
+
+    def high_water_marks(self) -> Dict[str, datetime]:
+        """返回 {新闻源ID: 已见过的最新发布时间}"""
+        with self._lock:
+            rows = self._conn.execute("SELECT source_id, last_published FROM source_marks").fetchall()
+        return {source_id: datetime.fromisoformat(published) for source_id, published in rows}
+
+    def filter_new(self, items: List[Dict]) -> List[Dict]:
+        """过滤掉已经记录过的新闻，保持原有顺序"""
+        ids = [self.item_id(item) for item in items]
+        seen = set()
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT item_id FROM seen_items WHERE item_id IN ({placeholders})", chunk
+                ).fetchall()
+                seen.update(row[0] for row in rows)
+
+        new_items = []
+        for item_id, item in zip(ids, items):
+            if item_id not in seen:
+                seen.add(item_id)  # 同一批次内的重复也只保留第一条
+                new_items.append(item)
+        return new_items
+
+    def record(self, items: Iterable[Dict], pending: bool = False):
+        """记录已收集的新闻
+
+        Args:
+            items: 新闻列表
+            pending: 同时把新闻保存为待发布（与记录在同一个事务中），发布后调用 remove_pending
+        """
+        items = list(items)
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (self.item_id(item), item.get('source'), item.get('title'),
+             item['published'].isoformat() if isinstance(item.get('published'), datetime) else None, now)
+            for item in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_items (item_id, source, title, published, first_seen) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            if pending:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO pending_items (item_id, data, added_at) VALUES (?, ?, ?)",
+                    [(row[0], self._to_json(item), now) for row, item in zip(rows, items)]
+                )
+
+    @staticmethod
+    def _to_json(item: Dict) -> str:
+        return (item if isinstance(item, NewsItem) else NewsItem.from_dict(item)).to_json()
+
+    def pending_items(self) -> List[NewsItem]:
+        """返回所有待发布的新闻（按加入的先后）"""
+        with self._lock:
+            rows = self._conn.execute("SELECT item_id, data FROM pending_items ORDER BY added_at").fetchall()
+        items = []
+        for item_id, data in rows:
+            try:
+                items.append(NewsItem.from_json(data))
+            except Exception as e:
+                self.logger.warning(f"读取待发布新闻 {item_id} 失败: {str(e)}")
+        return items
+
+    def remove_pending(self, items: Iterable[Dict]):
+        """已发布的新闻不再是待发布"""
+        ids = [(self.item_id(item),) for item in items]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM pending_items WHERE item_id = ?", ids)
+
+    def update_mark(self, source_id: str, published: Optional[datetime]):
+        """更新新闻源的高水位线（只会前移，不会超过当前时间）"""
+        if published is None:
+            return
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
+        published = clamp_future(published)
+        current = self.high_water_marks().get(source_id)
+        if current is not None and current >= published:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO source_marks (source_id, last_published, updated_at) VALUES (?, ?, ?)",
+                (source_id, published.isoformat(), datetime.now(timezone.utc).isoformat())
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
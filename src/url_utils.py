@@ -0,0 +1,46 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 不影响页面内容的跟踪参数
+TRACKING_PARAMS = {
+    'ref', 'ref_src', 'ref_url', 'referrer', 'source',
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', 'cmpid', 'guccounter', 'guce_referrer', 'guce_referrer_sig',
+    'spm', 'share_token', 'tt_from', 'from', 'smid', 'ncid', 'sr_share',
+}
+TRACKING_PREFIXES = ('utm_', '_hs', 'hsa_', 'pk_', 'mtm_')
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """返回用于判重的规范化URL
+
+    统一协议和主机名大小写，去掉 www. 前缀、默认端口、片段和跟踪参数
+    （utm_*、ref 等），其余查询参数按名称排序，路径末尾的斜杠去掉。
+    结果只用作新闻的唯一键，不用于展示。
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    port = parts.port
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not _is_tracking_param(name)]
+    query.sort()
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ''))
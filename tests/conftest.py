@@ -0,0 +1,5 @@
+import os
+import sys
+
+# src 下的模块按文件名直接导入（与 src/main.py 的运行方式相同）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
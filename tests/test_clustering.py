@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+
+from clustering import StoryClusterer
+from models import NewsItem
+
+NOW = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+def test_cluster_keeps_news_items():
+    items = [
+        NewsItem('Zorvex launches Kalinra reasoning model', 'https://a.com/1', NOW,
+                 'Zorvex unveiled Kalinra, a reasoning model for enterprise customers', 'A'),
+        NewsItem('Zorvex unveils Kalinra model for enterprise', 'https://b.com/2', NOW,
+                 'The Kalinra reasoning model from Zorvex targets enterprise customers', 'B'),
+        NewsItem('Chip startup raises funding', 'https://c.com/3', NOW, 'Unrelated funding round', 'C'),
+    ]
+    clustered = StoryClusterer().cluster(items)
+
+    assert len(clustered) == 2
+    assert all(isinstance(item, NewsItem) for item in clustered)
+    merged = clustered[0]
+    assert merged['sources'] == ['A', 'B']
+    assert merged['also_covered_by'][0]['link'] == 'https://b.com/2'
+    # 代表新闻是副本，输入不变
+    assert items[0].get('also_covered_by') is None
+
+
+def test_cluster_accepts_dicts():
+    items = [{'title': 'Zorvex launches Kalinra model', 'summary': 'Zorvex Kalinra', 'source': 'A', 'link': '1'},
+             {'title': 'Zorvex Kalinra model launches', 'summary': 'Kalinra by Zorvex', 'source': 'B', 'link': '2'}]
+    clustered = StoryClusterer().cluster(items)
+    assert len(clustered) == 1 and type(clustered[0]) is dict
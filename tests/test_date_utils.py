@@ -0,0 +1,91 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from date_utils import FUTURE_TOLERANCE, clamp_future, normalize_date, source_timezone
+
+CST = timezone(timedelta(hours=8))
+# 北京时间 2026-10-18 10:00
+NOW = datetime(2026, 10, 18, 2, 0, tzinfo=timezone.utc)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2026-10-17 08:30:00', utc(2026, 10, 17, 8, 30)),
+    ('2026/10/17', utc(2026, 10, 17)),
+    ('2026年10月17日 08:30', utc(2026, 10, 17, 8, 30)),
+    ('2026-10-17T08:30:00+08:00', utc(2026, 10, 17, 0, 30)),
+    ('Sat, 17 Oct 2026 08:30:00 GMT', utc(2026, 10, 17, 8, 30)),
+    ('October 17, 2026', utc(2026, 10, 17)),
+])
+def test_absolute_formats(value, expected):
+    assert normalize_date(value) == expected
+
+
+def test_naive_time_uses_default_timezone():
+    assert normalize_date('2026-10-17 08:30', default_tz=CST) == utc(2026, 10, 17, 0, 30)
+
+
+def test_struct_time_and_datetime():
+    assert normalize_date(time.struct_time((2026, 10, 17, 8, 30, 0, 0, 0, 0))) == utc(2026, 10, 17, 8, 30)
+    assert normalize_date(datetime(2026, 10, 17, 8, 30), default_tz=CST) == utc(2026, 10, 17, 0, 30)
+
+
+@pytest.mark.parametrize('value', [None, '', '   ', 'not a date'])
+def test_unparseable(value):
+    assert normalize_date(value) is None
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('刚刚', NOW),
+    ('5分钟前', NOW - timedelta(minutes=5)),
+    ('3小时前', NOW - timedelta(hours=3)),
+    ('昨天 08:30', utc(2026, 10, 17, 0, 30)),
+    ('前天', utc(2026, 10, 15, 16, 0)),
+    ('10月6日 14:00', utc(2026, 10, 6, 6, 0)),
+    # 没有年份、晚于今天的日期是去年的
+    ('12月25日', utc(2025, 12, 24, 16, 0)),
+])
+def test_relative_times(value, expected):
+    assert normalize_date(value, default_tz=CST, now=NOW) == expected
+
+
+def test_time_only_is_today():
+    assert normalize_date('09:15', default_tz=CST, now=NOW) == utc(2026, 10, 18, 1, 15)
+
+
+def test_time_only_later_than_now_is_yesterday():
+    assert normalize_date('23:59', default_tz=CST, now=NOW) == utc(2026, 10, 17, 15, 59)
+
+
+def test_time_only_follows_now():
+    """只有时间的字符串不能被缓存为某一天的结果"""
+    first = normalize_date('09:15', default_tz=CST, now=NOW)
+    second = normalize_date('09:15', default_tz=CST, now=NOW + timedelta(days=1))
+    assert second - first == timedelta(days=1)
+
+
+def test_fuzzy_parse_requires_full_date():
+    assert normalize_date('Saturday 17th of October 2026, 8:30') == utc(2026, 10, 17, 8, 30)
+    # 缺少年月日的字符串不用今天的日期补全
+    assert normalize_date('3') is None
+    assert normalize_date('Oct 17') is None
+
+
+def test_clamp_future():
+    assert clamp_future(None, NOW) is None
+    assert clamp_future(NOW - timedelta(days=1), NOW) == NOW - timedelta(days=1)
+    assert clamp_future(NOW + FUTURE_TOLERANCE, NOW) == NOW + FUTURE_TOLERANCE
+    assert clamp_future(NOW + timedelta(hours=13), NOW) == NOW
+
+
+def test_source_timezone():
+    assert source_timezone({}) == timezone.utc
+    assert source_timezone({'timezone': '+08:00'}) == CST
+    assert source_timezone({'timezone': '-0530'}) == timezone(-timedelta(hours=5, minutes=30))
+    with pytest.raises(ValueError):
+        source_timezone({'timezone': 'Asia/Shanghai'})
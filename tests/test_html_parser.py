@@ -0,0 +1,38 @@
+import pytest
+
+from html_parser import select_articles, strainer_for
+
+PAGE = (
+    '<nav><div class="item">导航</div></nav>'
+    '<div class="list clearfix">'
+    '<div class="item"><a href="/1">one</a></div>'
+    '<div class="item featured"><a href="/2">two</a></div>'
+    '</div>'
+    '<div class="c-compact-river__entry foo"><a href="/3">three</a></div>'
+    '<div class="c-compact-river__entry"><a href="/4">four</a></div>'
+    '<span class="c-compact-river__entry"><a href="/5">five</a></span>'
+)
+
+
+@pytest.mark.parametrize('selector, expected', [
+    ('.list .item', ['/1', '/2']),
+    ('div.c-compact-river__entry', ['/3', '/4']),
+    ('.c-compact-river__entry.foo', ['/3']),
+    ('div.list.clearfix div.featured', ['/2']),
+])
+def test_multiple_classes(selector, expected):
+    nodes = select_articles(PAGE, selector, 'html.parser')
+    assert [node.select_one('a').get('href') for node in nodes] == expected
+
+
+def test_strainer_matches_full_parse():
+    from bs4 import BeautifulSoup
+
+    for selector in ('.list .item', 'div.c-compact-river__entry', 'a'):
+        full = BeautifulSoup(PAGE, 'html.parser').select(selector)
+        assert len(select_articles(PAGE, selector, 'html.parser')) == len(full)
+
+
+def test_unsupported_selector_parses_whole_page():
+    assert strainer_for('.a, .b') is None
+    assert strainer_for('[data-id]') is None